@@ -2,6 +2,7 @@
 
 import pandas as pd
 import json
+import orjson
 import numpy as np
 import os
 from typing import Dict, List, Any, Tuple, Optional
@@ -19,12 +20,6 @@ def save_jsonl(data, path):
             f.write(json.dumps(entry) + "\n")
 
 
-def load_jsonl(path):
-    """Load data from JSONL format"""
-    with open(path, "r") as f:
-        return [json.loads(line) for line in f]
-
-
 def generate_accuracy_test_data(sample_size: Optional[int] = None) -> List[Dict]:
     """
     Generate test data specifically for accuracy analysis and make API calls
@@ -56,8 +51,7 @@ def generate_accuracy_test_data(sample_size: Optional[int] = None) -> List[Dict]
     for i, row in df.head(total_rows).iterrows():
         if analysis_status:
             progress = 15 + int((i + 1) / total_rows * 15)  # 15-30% for API calls
-            analysis_status["progress"] = progress
-            analysis_status["message"] = f"API call {i + 1}/{total_rows} for accuracy analysis..."
+            analysis_status.update(progress=progress, message=f"API call {i + 1}/{total_rows} for accuracy analysis...")
         
         input_data = row.to_dict()
         
@@ -89,10 +83,27 @@ def set_status_reference(status_ref):
     analysis_status = status_ref
 
 
-def load_jsonl(path: str) -> List[Dict]:
-    """Load JSONL file containing API responses"""
-    with open(path, "r") as f:
-        return [json.loads(line) for line in f]
+def load_jsonl(source) -> List[Dict]:
+    """
+    Load JSONL file containing API responses
+    
+    Args:
+        source: Path to the file, or an already open stream such as io.StringIO or io.BytesIO
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            data = f.read()
+    else:
+        data = source.read()
+    if isinstance(data, str):
+        # str.splitlines also breaks on U+2028, U+0085 and form feeds, which JSON strings may contain raw
+        data = data.encode("utf-8")
+    lines = [line for line in data.splitlines() if line.strip()]
+    try:
+        return list(map(orjson.loads, lines))
+    except orjson.JSONDecodeError:
+        # save_jsonl writes with json.dumps, which emits NaN for missing CSV values; orjson rejects those
+        return list(map(json.loads, lines))
 
 
 def extract_predictions_and_ground_truth(responses: List[Dict], ground_truth_source: str = "synthetic") -> Tuple[List[float], List[str], List[float], List[str]]:
@@ -107,8 +118,7 @@ def extract_predictions_and_ground_truth(responses: List[Dict], ground_truth_sou
     """
     predicted_scores = []
     predicted_classes = []
-    true_scores = []
-    true_classes = []
+    inputs = []
     
     for entry in responses:
         # Skip entries with errors
@@ -129,14 +139,14 @@ def extract_predictions_and_ground_truth(responses: List[Dict], ground_truth_sou
         except (ValueError, TypeError):
             continue
             
-        # Calculate ground truth based on financial indicators
-        input_data = entry["input"]
-        true_score, true_class = calculate_ground_truth(input_data)
-        
         predicted_scores.append(pred_score)
         predicted_classes.append(pred_class)
-        true_scores.append(true_score)
-        true_classes.append(true_class)
+        inputs.append(entry["input"])
+    
+    # Calculate ground truth based on financial indicators, for all valid entries at once
+    true_scores, true_classes = calculate_ground_truth_batch(inputs)
+    true_scores = true_scores.tolist()
+    true_classes = true_classes.tolist()
     
     logger.info(f"Extracted {len(predicted_scores)} valid predictions for accuracy analysis")
     return predicted_scores, predicted_classes, true_scores, true_classes
@@ -221,6 +231,44 @@ def calculate_ground_truth(input_data: Dict) -> Tuple[float, str]:
     return float(score), classification
 
 
+def _input_column(inputs: List[Dict], field: str, default: float) -> np.ndarray:
+    return np.fromiter((d.get(field, default) for d in inputs), dtype=float, count=len(inputs))
+
+
+def calculate_ground_truth_batch(inputs: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized calculate_ground_truth over many inputs.
+
+    Returns:
+        Tuple of (scores, classifications) arrays aligned with inputs
+    """
+    income = _input_column(inputs, "income", 0)
+    emp_duration = _input_column(inputs, "employment_duration_years", 0)
+    defaults = _input_column(inputs, "payment_defaults", 0)
+    credit_limit = _input_column(inputs, "credit_limit", 1)
+    used_credit = _input_column(inputs, "used_credit", 0)
+    inquiries = _input_column(inputs, "credit_inquiries_last_6_months", 0)
+    address_years = _input_column(inputs, "address_stability_years", 0)
+    existing_loans = _input_column(inputs, "existing_loans", 0)
+    is_owner = np.fromiter((d.get("housing_status") == "owner" for d in inputs), dtype=bool, count=len(inputs))
+    
+    score = 50.0 + np.select([income > 100000, income > 70000, income > 50000, income > 30000], [20, 15, 10, 5], 0)
+    score += np.select([emp_duration > 10, emp_duration > 5, emp_duration > 2], [15, 10, 5], 0)
+    score -= defaults * 15
+    utilization = used_credit / np.maximum(credit_limit, 1)
+    score += np.select([utilization < 0.3, utilization < 0.7], [10, 5], -10)
+    score -= inquiries * 2
+    score += np.where(is_owner, 5, 0)
+    score += np.select([address_years > 10, address_years > 5], [5, 3], 0)
+    score -= np.where(existing_loans > 3, 5, 0)
+    
+    # max(0, min(100, nan)) is 100 in the scalar version, so NaN scores clip to 100 here too
+    score = np.where(np.isnan(score), 100.0, np.clip(score, 0, 100))
+    classification = np.select([score >= 70, score >= 50], ["Good", "Average"], "Poor")
+    
+    return score, classification
+
+
 def calculate_regression_metrics(predicted_scores: List[float], true_scores: List[float]) -> Dict[str, float]:
     """Calculate regression metrics for credit scores"""
     if not predicted_scores or not true_scores or len(predicted_scores) != len(true_scores):
@@ -327,15 +375,22 @@ def calculate_classification_metrics(predicted_classes: List[str], true_classes:
 
 def calculate_confusion_matrix(pred_array: np.ndarray, true_array: np.ndarray, classes: List[str]) -> Dict[str, Dict[str, int]]:
     """Calculate confusion matrix"""
-    confusion_matrix = {}
+    # Encode labels as class indices (-1 for labels outside classes), then count every
+    # (true, predicted) pair with a single bincount
+    n = len(classes)
+    true_codes = np.full(len(true_array), -1)
+    pred_codes = np.full(len(pred_array), -1)
+    for i, class_name in enumerate(classes):
+        true_codes[true_array == class_name] = i
+        pred_codes[pred_array == class_name] = i
+    
+    valid = (true_codes >= 0) & (pred_codes >= 0)
+    counts = np.bincount(true_codes[valid] * n + pred_codes[valid], minlength=n * n).reshape(n, n)
     
-    for true_class in classes:
-        confusion_matrix[true_class] = {}
-        for pred_class in classes:
-            count = np.sum((true_array == true_class) & (pred_array == pred_class))
-            confusion_matrix[true_class][pred_class] = int(count)
-    
-    return confusion_matrix
+    return {
+        true_class: {pred_class: int(count) for pred_class, count in zip(classes, row)}
+        for true_class, row in zip(classes, counts)
+    }
 
 
 def analyze_score_distribution(predicted_scores: List[float], true_scores: List[float]) -> Dict[str, Any]:
@@ -386,12 +441,12 @@ def analyze_score_distribution(predicted_scores: List[float], true_scores: List[
     }
 
 
-def run_accuracy_analysis(response_path: str = "results/responses/bias_fairness.jsonl") -> Dict[str, Any]:
+def run_accuracy_analysis(response_path="results/responses/bias_fairness.jsonl") -> Dict[str, Any]:
     """
     Run accuracy analysis on credit scoring predictions
     
     Args:
-        response_path: Path to JSONL file containing API responses
+        response_path: Path to JSONL file containing API responses, or an open text stream
         
     Returns:
         Dictionary containing accuracy metrics and analysis
@@ -399,8 +454,7 @@ def run_accuracy_analysis(response_path: str = "results/responses/bias_fairness.
     logger.info("Starting accuracy analysis...")
     
     if analysis_status:
-        analysis_status["progress"] = 10
-        analysis_status["message"] = "Loading API responses for accuracy analysis..."
+        analysis_status.update(progress=10, message="Loading API responses for accuracy analysis...")
     
     # Try to load existing responses first
     responses = []
@@ -411,8 +465,7 @@ def run_accuracy_analysis(response_path: str = "results/responses/bias_fairness.
         logger.info(f"No existing response file found at {response_path}")
         
         if analysis_status:
-            analysis_status["progress"] = 15
-            analysis_status["message"] = "No existing API responses found. Generating test data and making API calls..."
+            analysis_status.update(progress=15, message="No existing API responses found. Generating test data and making API calls...")
         
         # Generate fresh test data and make API calls
         responses = generate_accuracy_test_data()
@@ -430,8 +483,7 @@ def run_accuracy_analysis(response_path: str = "results/responses/bias_fairness.
         return {"error": f"Error loading responses: {str(e)}"}
     
     if analysis_status:
-        analysis_status["progress"] = 30
-        analysis_status["message"] = f"Extracting predictions from {len(responses)} responses..."
+        analysis_status.update(progress=30, message=f"Extracting predictions from {len(responses)} responses...")
     
     # Extract predictions and ground truth
     predicted_scores, predicted_classes, true_scores, true_classes = extract_predictions_and_ground_truth(responses)
@@ -443,29 +495,25 @@ def run_accuracy_analysis(response_path: str = "results/responses/bias_fairness.
     logger.info(f"Extracted {len(predicted_scores)} valid predictions for analysis")
     
     if analysis_status:
-        analysis_status["progress"] = 50
-        analysis_status["message"] = f"Calculating regression metrics for {len(predicted_scores)} predictions..."
+        analysis_status.update(progress=50, message=f"Calculating regression metrics for {len(predicted_scores)} predictions...")
     
     # Calculate regression metrics (for credit scores)
     regression_metrics = calculate_regression_metrics(predicted_scores, true_scores)
     
     if analysis_status:
-        analysis_status["progress"] = 70
-        analysis_status["message"] = "Calculating classification metrics..."
+        analysis_status.update(progress=70, message="Calculating classification metrics...")
     
     # Calculate classification metrics
     classification_metrics = calculate_classification_metrics(predicted_classes, true_classes)
     
     if analysis_status:
-        analysis_status["progress"] = 85
-        analysis_status["message"] = "Analyzing score distributions..."
+        analysis_status.update(progress=85, message="Analyzing score distributions...")
     
     # Analyze score distribution
     distribution_analysis = analyze_score_distribution(predicted_scores, true_scores)
     
     if analysis_status:
-        analysis_status["progress"] = 95
-        analysis_status["message"] = "Finalizing accuracy analysis..."
+        analysis_status.update(progress=95, message="Finalizing accuracy analysis...")
     
     # Compile results
     results = {
@@ -492,8 +540,7 @@ def run_accuracy_analysis(response_path: str = "results/responses/bias_fairness.
                    f"Macro F1: {classification_metrics.get('macro_avg', {}).get('f1_score', 0):.3f}")
     
     if analysis_status:
-        analysis_status["progress"] = 100
-        analysis_status["message"] = "Accuracy analysis completed successfully!"
+        analysis_status.update(progress=100, message="Accuracy analysis completed successfully!")
     
     return results
 
@@ -43,8 +43,7 @@ def collect_responses(input_path, output_path):
 
     if analysis_status:
         start_pct = progress_start + int(0.20 * progress_range)  # 20% into allocated range
-        analysis_status["progress"] = start_pct
-        analysis_status["message"] = f"Starting API calls for {total_rows} profiles..."
+        analysis_status.update(progress=start_pct, message=f"Starting API calls for {total_rows} profiles...")
 
     for i, row in df.iterrows():
         input_data = row.to_dict()
@@ -53,8 +52,7 @@ def collect_responses(input_path, output_path):
             # Use 20% to 70% of allocated range for API calls
             call_progress = 0.20 + (i + 1) / total_rows * 0.50  
             progress = progress_start + int(call_progress * progress_range)
-            analysis_status["progress"] = progress
-            analysis_status["message"] = f"Making API call {i + 1}/{total_rows}: {input_data.get('name', 'Unknown')}..."
+            analysis_status.update(progress=progress, message=f"Making API call {i + 1}/{total_rows}: {input_data.get('name', 'Unknown')}...")
         
         prediction = send_request(input_data)
         responses.append({
@@ -69,8 +67,7 @@ def collect_responses(input_path, output_path):
     
     if analysis_status:
         end_pct = progress_start + int(0.75 * progress_range)  # 75% into allocated range
-        analysis_status["progress"] = end_pct
-        analysis_status["message"] = "All API calls completed successfully! Starting bias pattern analysis..."
+        analysis_status.update(progress=end_pct, message="All API calls completed successfully! Starting bias pattern analysis...")
 
 
 def demographic_parity(responses, protected_attr, positive_class="Good"):
@@ -269,27 +266,23 @@ def run_bias_analysis():
 
     if analysis_status:
         start_pct = progress_start + int(0.05 * progress_range)  # 5% into allocated range
-        analysis_status["progress"] = start_pct
-        analysis_status["message"] = f"Loaded {len(df)} records, checking for existing API responses..."
+        analysis_status.update(progress=start_pct, message=f"Loaded {len(df)} records, checking for existing API responses...")
 
     if not os.path.exists(response_path):
         if analysis_status:
             check_pct = progress_start + int(0.15 * progress_range)  # 15% into allocated range
-            analysis_status["progress"] = check_pct
-            analysis_status["message"] = "No existing responses found, making API calls..."
+            analysis_status.update(progress=check_pct, message="No existing responses found, making API calls...")
         collect_responses(dataset_path, response_path)
     else:
         if analysis_status:
             skip_pct = progress_start + int(0.75 * progress_range)  # Skip to 75% if using cached
-            analysis_status["progress"] = skip_pct
-            analysis_status["message"] = "Found existing API responses, starting bias analysis..."
+            analysis_status.update(progress=skip_pct, message="Found existing API responses, starting bias analysis...")
 
     responses = load_jsonl(response_path)
 
     if analysis_status:
         loaded_pct = progress_start + int(0.80 * progress_range)  # 80% into allocated range  
-        analysis_status["progress"] = loaded_pct
-        analysis_status["message"] = f"Loaded {len(responses)} API responses, starting bias pattern analysis..."
+        analysis_status.update(progress=loaded_pct, message=f"Loaded {len(responses)} API responses, starting bias pattern analysis...")
 
     results = {}
 
@@ -298,8 +291,7 @@ def run_bias_analysis():
             # Use 80% to 95% of allocated range for bias pattern analysis
             bias_progress = 0.80 + (i / total_attributes) * 0.15
             progress = progress_start + int(bias_progress * progress_range)
-            analysis_status["progress"] = progress
-            analysis_status["message"] = f"Analyzing bias patterns for {attr} ({i+1}/{total_attributes})..."
+            analysis_status.update(progress=progress, message=f"Analyzing bias patterns for {attr} ({i+1}/{total_attributes})...")
         
         logger.info(f"🔍 Analyzing demographic parity for: {attr}")
 
@@ -328,8 +320,7 @@ def run_bias_analysis():
 
     if analysis_status:
         final_pct = progress_start + int(0.98 * progress_range)  # 98% into allocated range
-        analysis_status["progress"] = final_pct
-        analysis_status["message"] = "Bias analysis complete, finalizing results..."
+        analysis_status.update(progress=final_pct, message="Bias analysis complete, finalizing results...")
 
     return results
 
@@ -17,9 +17,17 @@ from utils.logger import setup_logger
 from api.client import send_request
 import time
 import hashlib
+import re
+from operator import itemgetter
 
 logger = setup_logger("consistency", "results/logs/consistency.log")
 
+# First percentage in a response, e.g. "approved (85%)" -> "85"
+_CONFIDENCE_RE = re.compile(r'(\d+(?:\.\d+)?)%')
+
+# Response payload getter; map() over a C-level itemgetter avoids a bytecode loop
+_get_response = itemgetter("response")
+
 # Reference to global status for progress updates
 analysis_status = None
 
@@ -70,10 +78,10 @@ def load_jsonl(path):
 
 def hash_input_data(data: dict) -> str:
     """Create a hash of input data for tracking"""
-    # Sort keys to ensure consistent hashing
-    sorted_data = {k: data[k] for k in sorted(data.keys())}
-    data_str = json.dumps(sorted_data, sort_keys=True, default=str)
-    return hashlib.md5(data_str.encode()).hexdigest()
+    # Sort items to ensure consistent hashing; repr keeps 1 and "1" distinct
+    # without a JSON encoding pass, and blake2b is faster than md5 here
+    data_str = repr(sorted(data.items()))
+    return hashlib.blake2b(data_str.encode(), digest_size=16).hexdigest()
 
 def normalize_response_text(response) -> str:
     """Normalize response text for comparison"""
@@ -151,10 +159,9 @@ def extract_decision_and_confidence(response) -> Tuple[Optional[str], Optional[f
                 # Extract confidence from explanation or use improved score-based proxy
                 confidence = None
                 if explanation:
-                    import re
-                    confidence_matches = re.findall(r'(\d+(?:\.\d+)?)%', explanation)
-                    if confidence_matches:
-                        confidence = float(confidence_matches[0]) / 100.0
+                    confidence_match = _CONFIDENCE_RE.search(explanation)
+                    if confidence_match:
+                        confidence = float(confidence_match.group(1)) / 100.0
                     elif "high confidence" in explanation:
                         confidence = 0.9
                     elif "medium confidence" in explanation:
@@ -191,10 +198,9 @@ def extract_decision_and_confidence(response) -> Tuple[Optional[str], Optional[f
     # Extract confidence (look for percentages)
     confidence = None
     try:
-        import re
-        confidence_matches = re.findall(r'(\d+(?:\.\d+)?)%', response_text)
-        if confidence_matches:
-            confidence = float(confidence_matches[0]) / 100.0
+        confidence_match = _CONFIDENCE_RE.search(response_text)
+        if confidence_match:
+            confidence = float(confidence_match.group(1)) / 100.0
         elif "high confidence" in text_lower:
             confidence = 0.8
         elif "medium confidence" in text_lower:
@@ -218,8 +224,7 @@ def collect_consistency_responses(num_repeats: int = 3, delay_seconds: float = 1
     logger.info("Starting consistency analysis...")
     
     if analysis_status:
-        analysis_status["progress"] = 30
-        analysis_status["message"] = "Loading test data for consistency analysis..."
+        analysis_status.update(progress=30, message="Loading test data for consistency analysis...")
     
     # Load test data
     test_data_path = "data/testdata.csv"
@@ -238,15 +243,13 @@ def collect_consistency_responses(num_repeats: int = 3, delay_seconds: float = 1
     sample_df = df.sample(n=num_samples, random_state=42)
     
     if analysis_status:
-        analysis_status["progress"] = 40
-        analysis_status["message"] = f"Testing consistency with {num_samples} samples, {num_repeats} repeats each..."
+        analysis_status.update(progress=40, message=f"Testing consistency with {num_samples} samples, {num_repeats} repeats each...")
     
     consistency_data = []
     total_calls = num_samples * num_repeats
     call_count = 0
     
-    for idx, (_, row) in enumerate(sample_df.iterrows()):
-        input_data = row.to_dict()
+    for idx, input_data in enumerate(sample_df.to_dict(orient='records')):
         input_hash = hash_input_data(input_data)
         
         logger.info(f"Testing consistency for sample {idx + 1}/{num_samples}")
@@ -275,8 +278,7 @@ def collect_consistency_responses(num_repeats: int = 3, delay_seconds: float = 1
                 
                 if analysis_status:
                     progress = 40 + int((call_count / total_calls) * 40)  # 40-80% for API calls
-                    analysis_status["progress"] = progress
-                    analysis_status["message"] = f"API call {call_count}/{total_calls}: Sample {idx+1}, repeat {repeat+1}"
+                    analysis_status.update(progress=progress, message=f"API call {call_count}/{total_calls}: Sample {idx+1}, repeat {repeat+1}")
                 
                 logger.info(f"Completed call {call_count}/{total_calls}")
                 
@@ -308,8 +310,7 @@ def analyze_consistency_results(consistency_data: List[Dict]) -> Dict[str, Any]:
     logger.info("Analyzing consistency results...")
     
     if analysis_status:
-        analysis_status["progress"] = 85
-        analysis_status["message"] = "Analyzing consistency results..."
+        analysis_status.update(progress=85, message="Analyzing consistency results...")
     
     results = {
         "total_inputs": len(consistency_data),
@@ -337,16 +338,11 @@ def analyze_consistency_results(consistency_data: List[Dict]) -> Dict[str, Any]:
         if len(responses) < 2:
             continue  # Need at least 2 responses to check consistency
         
-        # Extract responses for analysis
-        response_texts = [normalize_response_text(r["response"]) for r in responses]
+        # Pull the response payloads into one column, then derive aligned columns from it
+        raw_responses = list(map(_get_response, responses))
+        response_texts = list(map(normalize_response_text, raw_responses))
         normalized_responses = response_texts
-        decisions = []
-        confidences = []
-        
-        for r in responses:
-            decision, confidence = extract_decision_and_confidence(r["response"])
-            decisions.append(decision)
-            confidences.append(confidence)
+        decisions, confidences = map(list, zip(*map(extract_decision_and_confidence, raw_responses)))
         
         # Check perfect text consistency
         perfect_consistent = len(set(normalized_responses)) == 1
@@ -369,11 +365,12 @@ def analyze_consistency_results(consistency_data: List[Dict]) -> Dict[str, Any]:
         
         # Calculate text similarity scores
         text_similarities = []
-        for i in range(len(response_texts)):
-            for j in range(i + 1, len(response_texts)):
+        word_sets = [set(text.split()) for text in normalized_responses]
+        for i in range(len(word_sets)):
+            for j in range(i + 1, len(word_sets)):
                 # Simple similarity based on common words
-                words1 = set(normalized_responses[i].split())
-                words2 = set(normalized_responses[j].split())
+                words1 = word_sets[i]
+                words2 = word_sets[j]
                 if words1 or words2:
                     similarity = len(words1.intersection(words2)) / len(words1.union(words2))
                 else:
@@ -484,8 +481,7 @@ def run_consistency_analysis(num_repeats: int = 3, delay_seconds: float = 1.0, s
             logger.info("Loading existing consistency responses...")
             consistency_data = load_jsonl(response_path)
             if analysis_status:
-                analysis_status["progress"] = 80
-                analysis_status["message"] = "Analyzing existing consistency data..."
+                analysis_status.update(progress=80, message="Analyzing existing consistency data...")
         else:
             # Collect new consistency data
             consistency_data = collect_consistency_responses(num_repeats, delay_seconds, sample_size)
@@ -27,15 +27,17 @@ def run_comprehensive_data_quality_analysis():
     logger.info("Starting comprehensive data quality analysis...")
     
     if analysis_status:
-        analysis_status["progress"] = 95
-        analysis_status["message"] = "Analyzing data quality across all modules..."
+        analysis_status.update(progress=95, message="Analyzing data quality across all modules...")
     
     # Get comprehensive data quality summary
     data_quality_summary = generate_data_quality_summary()
     
+    # The summary has already walked every response per module, so the counts are
+    # read from its breakdown instead of rescanning the collector
     collector = get_collector()
-    total_responses = collector.get_response_count()
-    module_counts = collector.get_module_counts()
+    module_counts = {module: stats["total_requests"]
+                     for module, stats in data_quality_summary["module_breakdown"].items()}
+    total_responses = sum(module_counts.values())
     
     logger.info(f"Data quality analysis complete:")
     logger.info(f"  Total responses analyzed: {total_responses}")
@@ -51,8 +53,7 @@ def run_comprehensive_data_quality_analysis():
         logger.info(f"Saved all {total_responses} responses to {output_path}")
     
     if analysis_status:
-        analysis_status["progress"] = 98
-        analysis_status["message"] = "Data quality analysis complete!"
+        analysis_status.update(progress=98, message="Data quality analysis complete!")
     
     return {
         "data_quality": data_quality_summary,
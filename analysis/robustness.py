@@ -160,8 +160,7 @@ def collect_robustness_responses():
     logger.info("Starting robustness analysis...")
     
     if analysis_status:
-        analysis_status["progress"] = 30
-        analysis_status["message"] = "Generating adversarial examples..."
+        analysis_status.update(progress=30, message="Generating adversarial examples...")
     
     # Load test data
     test_data_path = "data/testdata.csv"
@@ -180,8 +179,7 @@ def collect_robustness_responses():
     logger.info(f"Generated {len(adversarial_examples)} adversarial examples")
     
     if analysis_status:
-        analysis_status["progress"] = 40
-        analysis_status["message"] = f"Making API calls for {len(adversarial_examples)} adversarial examples..."
+        analysis_status.update(progress=40, message=f"Making API calls for {len(adversarial_examples)} adversarial examples...")
     
     responses = []
     total_examples = len(adversarial_examples)
@@ -207,8 +205,7 @@ def collect_robustness_responses():
             
             if analysis_status:
                 progress = 40 + int((i + 1) / total_examples * 40)  # 40-80% for API calls
-                analysis_status["progress"] = progress
-                analysis_status["message"] = f"Processing adversarial example {i + 1}/{total_examples}..."
+                analysis_status.update(progress=progress, message=f"Processing adversarial example {i + 1}/{total_examples}...")
             
             logger.info(f"Processed adversarial example {i + 1}/{total_examples}")
             
@@ -334,8 +331,7 @@ def analyze_robustness_results(responses: List[Dict]) -> Dict[str, Any]:
     logger.info("Analyzing robustness results...")
     
     if analysis_status:
-        analysis_status["progress"] = 85
-        analysis_status["message"] = "Analyzing robustness results..."
+        analysis_status.update(progress=85, message="Analyzing robustness results...")
     
     results = {
         "total_examples": len(responses),
@@ -458,8 +454,7 @@ def run_robustness_analysis():
             logger.info("Loading existing robustness responses...")
             responses = load_jsonl(response_path)
             if analysis_status:
-                analysis_status["progress"] = 80
-                analysis_status["message"] = "Analyzing existing robustness data..."
+                analysis_status.update(progress=80, message="Analyzing existing robustness data...")
         else:
             # Collect new responses
             responses = collect_robustness_responses()
@@ -910,8 +910,7 @@ def collect_transparency_responses(sample_size: int = 50) -> List[Dict]:
     for i, (idx, profile) in enumerate(sample_profiles.iterrows()):
         if analysis_status:
             progress = progress_start + int((i / total_profiles) * progress_range * 0.7)  # 70% for collection
-            analysis_status["progress"] = progress
-            analysis_status["message"] = f"Collecting transparency responses... ({i+1}/{total_profiles})"
+            analysis_status.update(progress=progress, message=f"Collecting transparency responses... ({i+1}/{total_profiles})")
         
         profile_dict = profile.to_dict()
         
@@ -963,8 +962,7 @@ def run_transparency_analysis(sample_size: int = 50) -> Dict:
             if analysis_status:
                 # Analysis phase takes 30% of progress range
                 progress = progress_start + int(0.7 * progress_range + (i / total_responses) * 0.3 * progress_range)
-                analysis_status["progress"] = progress
-                analysis_status["message"] = f"Analyzing transparency... ({i+1}/{total_responses})"
+                analysis_status.update(progress=progress, message=f"Analyzing transparency... ({i+1}/{total_responses})")
             
             profile = response_record['profile']
             api_response = response_record['api_response']
@@ -0,0 +1,69 @@
+# api/async_client.py
+
+import asyncio
+import httpx
+from api.client import construct_payload, parse_response_content, logger
+
+
+def make_async_client(max_connections: int = 32) -> httpx.AsyncClient:
+    """Create one client to share across requests so connections are reused"""
+    # Import config each time to get updated values from Flask app
+    from config import USERNAME, PASSWORD
+
+    return httpx.AsyncClient(
+        auth=httpx.BasicAuth(USERNAME, PASSWORD),
+        timeout=30,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    )
+
+
+async def send_request_async(row: dict, client: httpx.AsyncClient) -> dict:
+    """Async counterpart of send_request; returns the same result/error dicts"""
+    from config import API_URL
+
+    payload = construct_payload(row)
+    logger.info(f"🔍 Sending async request for row: {row.get('name')} with payload: {payload}")
+
+    try:
+        response = await client.post(f"{API_URL}/score", json=payload)
+        response.raise_for_status()
+        data = response.json()
+        parsed_content = parse_response_content(data)
+
+        logger.info(f"[{row.get('name')}] → Score: {parsed_content.get('credit_score')} | "
+                    f"Class: {parsed_content.get('classification')} | "
+                    f"Reason: {parsed_content.get('explanation')}")
+
+        return {
+            "raw_response": data,
+            "parsed": parsed_content,
+            "status": "success",
+            "status_code": response.status_code
+        }
+
+    except httpx.HTTPStatusError as e:
+        logger.error(f"HTTP error for row {row.get('name')}: {e} (Status: {e.response.status_code})")
+        return {"error_type": "http_error", "error": str(e), "status_code": e.response.status_code, "payload": payload}
+    except httpx.TimeoutException as e:
+        logger.error(f"Timeout error for row {row.get('name')}: {e}")
+        return {"error_type": "timeout", "error": str(e), "payload": payload}
+    except httpx.ConnectError as e:
+        logger.error(f"Connection error for row {row.get('name')}: {e}")
+        return {"error_type": "connection_error", "error": str(e), "payload": payload}
+    except httpx.HTTPError as e:
+        logger.error(f"Request error for row {row.get('name')}: {e}")
+        return {"error_type": "request_error", "error": str(e), "payload": payload}
+    except Exception as e:
+        logger.error(f"Unexpected error for row {row.get('name')}: {e}")
+        return {"error_type": "unknown_error", "error": str(e), "payload": payload}
+
+
+async def send_requests_async(rows: list, max_connections: int = 32) -> list:
+    """Send all rows concurrently over one client; results keep the input order"""
+    async with make_async_client(max_connections) as client:
+        return await asyncio.gather(*(send_request_async(row, client) for row in rows))
+
+
+def send_requests(rows: list, max_connections: int = 32) -> list:
+    """Blocking wrapper around send_requests_async for scripts"""
+    return asyncio.run(send_requests_async(rows, max_connections))
@@ -53,6 +53,25 @@ def construct_payload(row: dict) -> dict:
     }
 
 
+def parse_response_content(data: dict) -> dict:
+    """Extract score, classification and explanation from an API response body"""
+    # Handle the new API response format
+    if "credit_score" in data:
+        # New format: direct response with credit_score, classification, explanation
+        return {
+            "credit_score": data.get("credit_score"),
+            "classification": data.get("classification"),
+            "explanation": data.get("explanation")
+        }
+    # Try old format if available
+    try:
+        content = data["metadata"]["choices"][0]["message"]["content"]
+        return eval(content)  # ⚠️ Assumes it's JSON string in string form
+    except Exception as e:
+        logger.warning(f"Could not parse content from message: {e}")
+        return {}
+
+
 def send_request(row: dict) -> dict:
     payload = construct_payload(row)
     logger.info(f"🔍 Sending request for row: {row.get('name')} with payload: {payload}")
@@ -90,23 +109,7 @@ def send_request(row: dict) -> dict:
         )
         response.raise_for_status()
         data = response.json()
-
-        # Handle the new API response format
-        if "credit_score" in data:
-            # New format: direct response with credit_score, classification, explanation
-            parsed_content = {
-                "credit_score": data.get("credit_score"),
-                "classification": data.get("classification"),
-                "explanation": data.get("explanation")
-            }
-        else:
-            # Try old format if available
-            try:
-                content = data["metadata"]["choices"][0]["message"]["content"]
-                parsed_content = eval(content)  # ⚠️ Assumes it's JSON string in string form
-            except Exception as e:
-                logger.warning(f"Could not parse content from message: {e}")
-                parsed_content = {}
+        parsed_content = parse_response_content(data)
 
         # Log core info
         logger.info(f"[{row.get('name')}] → Score: {parsed_content.get('credit_score')} | "
@@ -1,30 +1,52 @@
 # app.py
 
-from flask import Flask, render_template, request, redirect, url_for, send_from_directory, jsonify, flash
+from flask import Flask, Response, render_template, request, redirect, url_for, send_from_directory, jsonify, flash
+from werkzeug.exceptions import NotFound
+from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 import os
 import threading
-import time
-import json
-from analysis.bias_fairness import run_bias_analysis
-from analysis.accuracy import run_accuracy_analysis
-from analysis.robustness import run_robustness_analysis
-from analysis.consistency import run_consistency_analysis
-from analysis.transparency import run_transparency_analysis
-from analysis.data_quality_analyzer import run_comprehensive_data_quality_analysis
-from reports.report_builder import build_bias_fairness_report, build_accuracy_report, build_robustness_report, build_consistency_report, build_transparency_report, build_comprehensive_data_quality_report
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+import orjson
+from flask.json.provider import JSONProvider
+from analysis.bias_fairness import run_bias_analysis, set_status_reference as set_bias_status
+from analysis.accuracy import run_accuracy_analysis, set_status_reference as set_accuracy_status
+from analysis.robustness import run_robustness_analysis, set_status_reference as set_robustness_status
+from analysis.consistency import run_consistency_analysis, set_status_reference as set_consistency_status
+from analysis.transparency import run_transparency_analysis, set_status_reference as set_transparency_status
+from analysis.data_quality_analyzer import run_comprehensive_data_quality_analysis, set_status_reference as set_data_quality_status
+from reports.report_builder import preload_templates, build_bias_fairness_report, build_accuracy_report, build_robustness_report, build_consistency_report, build_transparency_report, build_comprehensive_data_quality_report
 from utils.response_collector import reset_collector
+from utils.progress import AnalysisStatus
 from auth.user_manager import UserManager, User
 from auth.forms import LoginForm, CreateUserForm, ChangePasswordForm
 import config
 
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson for jsonify and request.get_json"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Configure Flask app for production if deployed
 if os.environ.get('FLASK_ENV') == 'production':
     app.config.from_object('config_prod.Config')
 else:
     app.config['SECRET_KEY'] = 'dev-secret-key'
+    app.config['BCRYPT_ROUNDS'] = int(os.environ.get('BCRYPT_ROUNDS', 12))
+
+# Behind a proxy remote_addr is the proxy's address; login throttling needs the client's
+if app.config.get('TRUSTED_PROXY_COUNT'):
+    proxy_count = app.config['TRUSTED_PROXY_COUNT']
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_count, x_proto=proxy_count)
 
 # Initialize Flask-Login
 login_manager = LoginManager()
@@ -33,31 +55,184 @@ login_manager.login_view = 'login'
 login_manager.login_message = 'Please log in to access this page.'
 login_manager.login_message_category = 'info'
 
-# Setup default admin user if none exist
-with app.app_context():
-    default_password = UserManager.setup_default_admin()
-    if default_password:
-        print("\n" + "="*60)
-        print("🔑 IMPORTANT: Default admin credentials created!")
-        print(f"   Username: admin")
-        print(f"   Password: {default_password}")
-        print("   ⚠️  Please save this password securely!")
-        print("="*60 + "\n")
-
 @login_manager.user_loader
 def load_user(user_id):
     """Load user for Flask-Login"""
     return UserManager.get_user(user_id)
 
+# Report rendering runs in worker processes so the next analysis can start immediately.
+# gunicorn preloads this module and forks its workers, so each process creates its own
+# pool on first use (an inherited pool would share the parent's queues). Workers are
+# spawned because the requesting process already runs threads and must not fork itself.
+_report_pool = None
+_report_pool_pid = None
+_report_pool_lock = threading.Lock()
+
+def _get_report_pool():
+    """Report pool owned by the current process"""
+    global _report_pool, _report_pool_pid
+    with _report_pool_lock:
+        if _report_pool is None or _report_pool_pid != os.getpid():
+            _report_pool = ProcessPoolExecutor(
+                max_workers=2,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=preload_templates
+            )
+            _report_pool_pid = os.getpid()
+        return _report_pool
+
+def _submit_report(build_fn, data):
+    """Queue a report build, replacing the pool if a crashed worker has broken it"""
+    global _report_pool
+    try:
+        return _get_report_pool().submit(build_fn, data)
+    except BrokenProcessPool:
+        app.logger.warning("Report pool was broken; starting a new one")
+        with _report_pool_lock:
+            _report_pool = None
+        return _get_report_pool().submit(build_fn, data)
+
+REPORTS_DIR = "reports/generated"
+REPORT_FILES = {
+    "bias_fairness": "bias_report.html",
+    "accuracy": "accuracy_report.html",
+    "robustness": "robustness_report.html",
+    "consistency": "consistency_report.html",
+    "transparency": "transparency_report.html",
+    "comprehensive_data_quality": "comprehensive_data_quality_report.html",
+}
+
+# Reports known to exist, so report views skip the stat call; other gunicorn
+# workers' builds are picked up on the first miss
+_available_reports = set()
+_available_reports_lock = threading.Lock()
+
+def _mark_report(filename, available):
+    """Record whether a generated report is on disk"""
+    with _available_reports_lock:
+        if available:
+            _available_reports.add(filename)
+        else:
+            _available_reports.discard(filename)
+
+def _prime_available_reports():
+    """Seed the available-report set from the reports directory"""
+    try:
+        with os.scandir(REPORTS_DIR) as entries:
+            for entry in entries:
+                if entry.name.endswith(".html") and entry.is_file():
+                    _mark_report(entry.name, True)
+    except FileNotFoundError:
+        pass
+
+def _track_report(future, filename):
+    """Mark a report available once its build future succeeds"""
+    def _on_done(done):
+        _mark_report(filename, not done.cancelled() and done.exception() is None)
+    future.add_done_callback(_on_done)
+    return future
+
+def _startup():
+    """One-time server setup: fold pending user changes into users.json, create the
+    default admin user if none exist and seed the available-report set"""
+    with app.app_context():
+        UserManager.compact()
+        default_password = UserManager.setup_default_admin()
+        if default_password:
+            print("\n" + "="*60)
+            print("🔑 IMPORTANT: Default admin credentials created!")
+            print(f"   Username: admin")
+            print(f"   Password: {default_password}")
+            print("   ⚠️  Please save this password securely!")
+            print("="*60 + "\n")
+    _prime_available_reports()
+
+# Under `python app.py` the spawned report workers re-import this module as __mp_main__;
+# they only render reports, so the server setup runs in the serving process alone
+if __name__ != "__mp_main__":
+    _startup()
+
 # Global variables to track analysis progress
-analysis_status = {
-    "running": False,
-    "completed": False,
-    "error": None,
-    "progress": 0,
-    "message": "Ready to start analysis"
+analysis_status = AnalysisStatus()
+
+def set_status(**fields):
+    """Update several analysis status fields atomically"""
+    analysis_status.update(**fields)
+
+# Relative share of overall progress per analysis, reflecting how long each takes
+ANALYSIS_WEIGHTS = {
+    "bias_fairness": 45,    # many API calls
+    "robustness": 17,       # 200+ API calls
+    "transparency": 11,     # LIME + analysis
+    "consistency": 6,       # ~30 API calls
+    "accuracy": 5           # mostly data analysis
 }
 
+class _TaskStatus(dict):
+    """Status dict handed to one analysis while analyses run concurrently
+    
+    Progress written here is relative to the analysis itself (0-100) and is
+    folded into a weighted overall progress on the shared analysis_status.
+    """
+    
+    # Shared by every task so a slower thread can't publish an older total over a newer one
+    _fold_lock = threading.Lock()
+    
+    def __init__(self, task_statuses, key):
+        super().__init__(progress=0, message="")
+        self.task_statuses = task_statuses
+        self.weight = ANALYSIS_WEIGHTS[key]
+    
+    def __setitem__(self, key, value):
+        self.update({key: value})
+    
+    def update(self, *args, **changes):
+        """Apply task fields and forward them to the shared status in one update"""
+        changes = dict(*args, **changes)
+        with _TaskStatus._fold_lock:
+            super().update(changes)
+            overall = {}
+            if "progress" in changes:
+                total_weight = sum(task.weight for task in self.task_statuses.values())
+                done = sum(task.weight * min(task["progress"], 100) for task in self.task_statuses.values())
+                overall["progress"] = 5 + int(89 * done / (100 * total_weight))
+            if "message" in changes:
+                overall["message"] = changes["message"]
+            if overall:
+                set_status(**overall)
+
+# (results key, form flag, runner, status hook, report builder) for each concurrent analysis
+ANALYSIS_TASKS = (
+    ("bias_fairness", "run_bias", run_bias_analysis, set_bias_status, build_bias_fairness_report),
+    ("robustness", "run_robustness", run_robustness_analysis, set_robustness_status, build_robustness_report),
+    ("transparency", "run_transparency", run_transparency_analysis, set_transparency_status, build_transparency_report),
+    ("consistency", "run_consistency", run_consistency_analysis, set_consistency_status, build_consistency_report),
+    ("accuracy", "run_accuracy", run_accuracy_analysis, set_accuracy_status, build_accuracy_report),
+)
+
+def _run_analysis_task(run_fn, prerequisite=None):
+    """Run one analysis, first waiting for any analysis whose output it reuses"""
+    if prerequisite is not None:
+        prerequisite.result()
+    return run_fn()
+
+# Form fields accepted by /start_analysis
+_STR_FIELDS = ("api_url", "username", "password", "model")
+_ANALYSIS_FIELDS = (
+    "run_bias", "run_accuracy", "run_robustness",
+    "run_consistency", "run_transparency", "run_data_quality"
+)
+# Analyses that call the scoring API and therefore need credentials
+_API_ANALYSIS_FIELDS = ("run_bias", "run_robustness", "run_consistency", "run_transparency")
+_BOOL_FIELDS = _ANALYSIS_FIELDS + (
+    "clear_bias_cache", "clear_consistency_cache", "clear_robustness_cache",
+    "clear_transparency_cache", "clear_data_quality_cache", "clear_all_cache"
+)
+# Empty form shown on the dashboard; all analyses and cache options unchecked
+_DEFAULT_FORM_DATA = {field: "" for field in _STR_FIELDS}
+_DEFAULT_FORM_DATA.update({field: False for field in _BOOL_FIELDS})
+_DEFAULT_FORM_DATA["model"] = "gpt-3.5-turbo-0125"
+
 def archive_existing_reports():
     """Archive existing reports to timestamped archive directory"""
     import os
@@ -92,6 +267,7 @@ def archive_existing_reports():
         dst_path = os.path.join(archive_dir, report_file)
         try:
             shutil.move(src_path, dst_path)
+            _mark_report(report_file, False)
             archived_files.append(report_file)
         except Exception as e:
             print(f"Warning: Could not archive {report_file}: {e}")
@@ -170,15 +346,15 @@ def run_analysis_background(form_data):
         if cleared_files:
             message_parts.append(f"Cleared cache files: {', '.join(cleared_files)}")
         
-        if message_parts:
-            analysis_status["message"] = " | ".join(message_parts)
-            time.sleep(2)  # Brief pause to show the message
-        
-        analysis_status["running"] = True
-        analysis_status["completed"] = False
-        analysis_status["error"] = None
-        analysis_status["progress"] = 5
-        analysis_status["message"] = "Starting analysis..."
+        # Surface the cache summary alongside progress instead of pausing to show it
+        set_status(
+            running=True,
+            completed=False,
+            error=None,
+            progress=5,
+            message="Starting analysis...",
+            cache_message=" | ".join(message_parts) if message_parts else None
+        )
         
         # Update config with form values
         config.API_URL = form_data["api_url"]
@@ -187,147 +363,88 @@ def run_analysis_background(form_data):
         config.MODEL = form_data.get("model", "gpt-3.5-turbo-0125")
         
         results = {}
-        total_analyses = sum([form_data["run_bias"], form_data["run_accuracy"], form_data["run_robustness"], form_data["run_consistency"], form_data["run_transparency"], form_data["run_data_quality"]])
-        
-        # Define realistic progress ranges based on actual analysis time
-        # These percentages reflect the relative time each analysis takes
-        progress_ranges = {
-            "bias_fairness": (10, 55),      # 45% of total time (many API calls)
-            "robustness": (55, 72),         # 17% of total time (200+ API calls) 
-            "transparency": (72, 83),       # 11% of total time (LIME + analysis)
-            "consistency": (83, 89),        # 6% of total time (~30 API calls)
-            "accuracy": (89, 94),           # 5% of total time (mostly data analysis)
-            "data_quality": (94, 98)        # 4% of total time (analysis only)
-        }
-        
-        current_analysis = 0
-        
-        # Run bias analysis if selected
-        if form_data["run_bias"]:
-            current_analysis += 1
-            start_progress, end_progress = progress_ranges["bias_fairness"]
-            analysis_status["progress"] = start_progress
-            analysis_status["message"] = f"Running bias analysis ({current_analysis}/{total_analyses})..."
-            
-            # Pass status reference to bias analysis with progress range
-            from analysis.bias_fairness import set_status_reference
-            set_status_reference(analysis_status, start_progress, end_progress - start_progress)
-            
-            bias_results = run_bias_analysis()
-            results["bias_fairness"] = bias_results
-            
-            # Build bias report
-            analysis_status["progress"] = end_progress - 2
-            analysis_status["message"] = f"Building bias fairness report..."
-            build_bias_fairness_report(bias_results)
-        
-        # Run accuracy analysis if selected
-        if form_data["run_accuracy"]:
-            current_analysis += 1
-            start_progress, end_progress = progress_ranges["accuracy"]
-            analysis_status["progress"] = start_progress
-            analysis_status["message"] = f"Running accuracy analysis ({current_analysis}/{total_analyses})..."
-            
-            # Pass status reference to accuracy analysis
-            from analysis.accuracy import set_status_reference
-            set_status_reference(analysis_status)
-            
-            accuracy_results = run_accuracy_analysis()
-            results["accuracy"] = accuracy_results
-            
-            # Build accuracy report
-            analysis_status["progress"] = end_progress - 1
-            analysis_status["message"] = f"Building accuracy report..."
-            build_accuracy_report(accuracy_results)
-        
-        # Run robustness analysis if selected
-        if form_data["run_robustness"]:
-            current_analysis += 1
-            start_progress, end_progress = progress_ranges["robustness"]
-            analysis_status["progress"] = start_progress
-            analysis_status["message"] = f"Running robustness analysis ({current_analysis}/{total_analyses})..."
-            
-            # Pass status reference to robustness analysis
-            from analysis.robustness import set_status_reference
-            set_status_reference(analysis_status)
-            
-            robustness_results = run_robustness_analysis()
-            results["robustness"] = robustness_results
-            
-            # Build robustness report
-            analysis_status["progress"] = end_progress - 1
-            analysis_status["message"] = f"Building robustness report..."
-            build_robustness_report(robustness_results)
-        
-        # Run consistency analysis if selected
-        if form_data["run_consistency"]:
-            current_analysis += 1
-            start_progress, end_progress = progress_ranges["consistency"]
-            analysis_status["progress"] = start_progress
-            analysis_status["message"] = f"Running consistency analysis ({current_analysis}/{total_analyses})..."
-            
-            # Pass status reference to consistency analysis
-            from analysis.consistency import set_status_reference
-            set_status_reference(analysis_status)
-            
-            consistency_results = run_consistency_analysis()
-            results["consistency"] = consistency_results
-            
-            # Build consistency report
-            analysis_status["progress"] = end_progress - 1
-            analysis_status["message"] = f"Building consistency report..."
-            build_consistency_report(consistency_results)
-        
-        # Run transparency analysis if selected
-        if form_data["run_transparency"]:
-            current_analysis += 1
-            start_progress, end_progress = progress_ranges["transparency"]
-            analysis_status["progress"] = start_progress
-            analysis_status["message"] = f"Running transparency analysis ({current_analysis}/{total_analyses})..."
-            
-            # Pass status reference to transparency analysis
-            from analysis.transparency import set_status_reference
-            set_status_reference(analysis_status, start_progress, end_progress - start_progress)
-            
-            transparency_results = run_transparency_analysis()
-            results["transparency"] = transparency_results
-            
-            # Build transparency report
-            analysis_status["progress"] = end_progress - 1
-            analysis_status["message"] = f"Building transparency report..."
-            build_transparency_report(transparency_results)
+        report_futures = []
+        # A failed analysis is recorded here and the others still finish and get reports
+        failed_analyses = {}
+        
+        # Analyses that call the API are independent and run concurrently; accuracy
+        # reuses the bias responses, so it waits for bias when both are selected
+        selected_tasks = [task for task in ANALYSIS_TASKS if form_data[task[1]]]
+        total_analyses = len(selected_tasks)
+        
+        # Each analysis reports its own 0-100 progress into a per-task status
+        task_statuses = {}
+        for key, _, _, set_reference, _ in selected_tasks:
+            task_statuses[key] = _TaskStatus(task_statuses, key)
+            set_reference(task_statuses[key])
+        
+        if selected_tasks:
+            set_status(message=f"Running {total_analyses} analyses...")
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = {}
+                bias_future = None
+                for key, _, run_fn, _, build_fn in selected_tasks:
+                    prerequisite = bias_future if key == "accuracy" else None
+                    future = executor.submit(_run_analysis_task, run_fn, prerequisite)
+                    futures[future] = (key, build_fn)
+                    if key == "bias_fairness":
+                        bias_future = future
+                
+                for completed_count, future in enumerate(as_completed(futures), start=1):
+                    key, build_fn = futures[future]
+                    try:
+                        results[key] = future.result()
+                    except Exception as e:
+                        failed_analyses[key] = e
+                        app.logger.error(f"{key} analysis failed: {str(e)}", exc_info=e)
+                        set_status(message=f"Completed {completed_count}/{total_analyses} analyses, {key} failed: {str(e)}")
+                        continue
+                    task_statuses[key]["progress"] = 100
+                    set_status(message=f"Completed {completed_count}/{total_analyses} analyses, building {key} report...")
+                    report_futures.append(_track_report(_submit_report(build_fn, results[key]), REPORT_FILES[key]))
         
         # Run comprehensive data quality analysis on all collected responses (if selected)
         if form_data["run_data_quality"]:
-            start_progress, end_progress = progress_ranges["data_quality"]
-            analysis_status["progress"] = start_progress
-            analysis_status["message"] = "Running comprehensive data quality analysis..."
+            start_progress, end_progress = 94, 98
+            set_status(progress=start_progress, message="Running comprehensive data quality analysis...")
             
-            from analysis.data_quality_analyzer import set_status_reference as set_dq_status_reference
-            set_dq_status_reference(analysis_status)
+            set_data_quality_status(analysis_status)
             
             data_quality_results = run_comprehensive_data_quality_analysis()
             results["comprehensive_data_quality"] = data_quality_results
             
             # Build comprehensive data quality report
-            analysis_status["progress"] = end_progress - 1
-            analysis_status["message"] = "Building comprehensive data quality report..."
-            build_comprehensive_data_quality_report(data_quality_results)
+            set_status(progress=end_progress - 1, message="Building comprehensive data quality report...")
+            report_futures.append(_track_report(
+                _submit_report(build_comprehensive_data_quality_report, data_quality_results),
+                REPORT_FILES["comprehensive_data_quality"]
+            ))
             
             total_responses = data_quality_results['total_responses_analyzed']
         else:
             # Count responses from other analyses if data quality wasn't run
             total_responses = sum(len(results.get(key, {}).get('responses', [])) for key in results.keys())
         
-        analysis_status["progress"] = 100
-        analysis_status["message"] = f"All analyses completed! Processed {total_responses} total API responses."
-        analysis_status["completed"] = True
-        analysis_status["running"] = False
+        # Wait for reports still rendering in the pool; result() re-raises build errors
+        set_status(message="Finishing reports...")
+        wait(report_futures)
+        for future in report_futures:
+            future.result()
+        
+        if failed_analyses:
+            error = "; ".join(f"{key}: {str(e)}" for key, e in failed_analyses.items())
+            set_status(running=False, error=error, message=f"Error: {error}")
+            return
+        
+        set_status(
+            progress=100,
+            message=f"All analyses completed! Processed {total_responses} total API responses.",
+            completed=True,
+            running=False
+        )
         
     except Exception as e:
-        analysis_status["running"] = False
-        analysis_status["error"] = str(e)
-        analysis_status["message"] = f"Error: {str(e)}"
+        set_status(running=False, error=str(e), message=f"Error: {str(e)}")
         app.logger.error(f"Background analysis failed: {str(e)}")
         import traceback
         app.logger.error(f"Full traceback: {traceback.format_exc()}")
@@ -341,7 +458,11 @@ def login():
     
     form = LoginForm()
     if form.validate_on_submit():
-        user = UserManager.authenticate_user(form.username.data, form.password.data)
+        if UserManager.is_login_throttled(form.username.data, request.remote_addr):
+            flash('Too many failed login attempts. Please try again in a minute.', 'error')
+            return render_template('login.html', form=form), 429
+        
+        user = UserManager.authenticate_user(form.username.data, form.password.data, request.remote_addr)
         if user:
             login_user(user, remember=form.remember_me.data)
             flash('Login successful!', 'success')
@@ -368,25 +489,7 @@ def logout():
 @login_required
 def index():
     # Provide default form data for template
-    form_data = {
-        "api_url": "",
-        "username": "",
-        "password": "",
-        "run_bias": False,
-        "run_accuracy": False,
-        "run_robustness": False,
-        "run_consistency": False,
-        "run_transparency": False,
-        "run_data_quality": False,
-        "model": "gpt-3.5-turbo-0125",
-        # Cache management defaults
-        "clear_bias_cache": False,
-        "clear_consistency_cache": False,
-        "clear_robustness_cache": False,
-        "clear_transparency_cache": False,
-        "clear_data_quality_cache": False,
-        "clear_all_cache": False
-    }
+    form_data = dict(_DEFAULT_FORM_DATA)
     return render_template("index.html", form_data=form_data)
 
 
@@ -409,36 +512,24 @@ def start_analysis():
     if analysis_status["running"]:
         return jsonify({"error": "Analysis already running"}), 400
     
-    form_data = {
-        "api_url": request.form.get("api_url", ""),
-        "username": request.form.get("username", ""),
-        "password": request.form.get("password", ""),
-        "run_bias": request.form.get("run_bias") == "on",
-        "run_accuracy": request.form.get("run_accuracy") == "on",
-        "run_robustness": request.form.get("run_robustness") == "on",
-        "run_consistency": request.form.get("run_consistency") == "on",
-        "run_transparency": request.form.get("run_transparency") == "on",
-        "run_data_quality": request.form.get("run_data_quality") == "on",
-        "model": request.form.get("model", "gpt-3.5-turbo-0125"),
-        # Cache management options
-        "clear_bias_cache": request.form.get("clear_bias_cache") == "on",
-        "clear_consistency_cache": request.form.get("clear_consistency_cache") == "on",
-        "clear_robustness_cache": request.form.get("clear_robustness_cache") == "on",
-        "clear_transparency_cache": request.form.get("clear_transparency_cache") == "on",
-        "clear_data_quality_cache": request.form.get("clear_data_quality_cache") == "on",
-        "clear_all_cache": request.form.get("clear_all_cache") == "on"
-    }
+    form = request.form
+    form_data = {field: form.get(field, "") for field in _STR_FIELDS}
+    form_data.update({field: form.get(field) == "on" for field in _BOOL_FIELDS})
+    if "model" not in form:
+        form_data["model"] = "gpt-3.5-turbo-0125"
     
     # Validate that at least one analysis is selected
-    if not (form_data["run_bias"] or form_data["run_accuracy"] or form_data["run_robustness"] or form_data["run_consistency"] or form_data["run_transparency"] or form_data["run_data_quality"]):
+    if not any(form_data[field] for field in _ANALYSIS_FIELDS):
         return jsonify({"error": "Please select at least one analysis to run."}), 400
     
+    needs_api = any(form_data[field] for field in _API_ANALYSIS_FIELDS)
+    
     # Validate required fields for analyses that need API calls
-    if (form_data["run_bias"] or form_data["run_robustness"] or form_data["run_consistency"] or form_data["run_transparency"]) and not all([form_data["api_url"], form_data["username"], form_data["password"]]):
+    if needs_api and not all([form_data["api_url"], form_data["username"], form_data["password"]]):
         return jsonify({"error": "Please fill in all API configuration fields for bias/robustness/consistency/transparency analysis."}), 400
     
     # For accuracy analysis, we can run it on existing data even without API credentials
-    if form_data["run_bias"] or form_data["run_accuracy"] or form_data["run_robustness"] or form_data["run_consistency"] or form_data["run_transparency"]:
+    if needs_api or form_data["run_accuracy"]:
         # Start analysis in background thread
         thread = threading.Thread(target=run_analysis_background, args=(form_data,))
         thread.daemon = True
@@ -453,61 +544,67 @@ def start_analysis():
 @login_required
 def get_status():
     """Get the current analysis status"""
-    return jsonify(analysis_status)
+    return Response(analysis_status.to_json(), mimetype="application/json")
+
+
+# Reports are rewritten in place by each run, so browsers always revalidate (ETag/Last-Modified -> 304)
+REPORT_MAX_AGE = 0
+
+def _send_report(filename, missing_message):
+    """Serve a generated report with conditional-GET support"""
+    if filename not in _available_reports:
+        if not os.path.exists(os.path.join(REPORTS_DIR, filename)):
+            return missing_message, 404
+        _mark_report(filename, True)
+    accel_prefix = app.config.get("REPORTS_ACCEL_PREFIX")
+    if accel_prefix:
+        # nginx serves the file from its internal location; the worker only sends headers
+        response = Response(mimetype="text/html")
+        response.headers["X-Accel-Redirect"] = accel_prefix.rstrip("/") + "/" + filename
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+    try:
+        return send_from_directory(REPORTS_DIR, filename, conditional=True, max_age=REPORT_MAX_AGE)
+    except NotFound:
+        # Archived by a run in another worker since we last saw it
+        _mark_report(filename, False)
+        return missing_message, 404
 
 
 @app.route("/report")
 @login_required
 def view_report():
-    report_file = "reports/generated/bias_report.html"
-    if not os.path.exists(report_file):
-        return "Report not found. Please run the bias analysis first.", 404
-    return send_from_directory("reports/generated", "bias_report.html")
+    return _send_report(REPORT_FILES["bias_fairness"], "Report not found. Please run the bias analysis first.")
 
 
 @app.route("/accuracy_report")
 @login_required
 def view_accuracy_report():
-    report_file = "reports/generated/accuracy_report.html"
-    if not os.path.exists(report_file):
-        return "Accuracy report not found. Please run the accuracy analysis first.", 404
-    return send_from_directory("reports/generated", "accuracy_report.html")
+    return _send_report(REPORT_FILES["accuracy"], "Accuracy report not found. Please run the accuracy analysis first.")
 
 
 @app.route("/robustness_report")
 @login_required
 def view_robustness_report():
-    report_file = "reports/generated/robustness_report.html"
-    if not os.path.exists(report_file):
-        return "Robustness report not found. Please run the robustness analysis first.", 404
-    return send_from_directory("reports/generated", "robustness_report.html")
+    return _send_report(REPORT_FILES["robustness"], "Robustness report not found. Please run the robustness analysis first.")
 
 
 @app.route("/consistency_report")
 @login_required
 def view_consistency_report():
-    report_file = "reports/generated/consistency_report.html"
-    if not os.path.exists(report_file):
-        return "Consistency report not found. Please run the consistency analysis first.", 404
-    return send_from_directory("reports/generated", "consistency_report.html")
+    return _send_report(REPORT_FILES["consistency"], "Consistency report not found. Please run the consistency analysis first.")
 
 
 @app.route("/transparency_report")
 @login_required
 def view_transparency_report():
-    report_file = "reports/generated/transparency_report.html"
-    if not os.path.exists(report_file):
-        return "Transparency report not found. Please run the transparency analysis first.", 404
-    return send_from_directory("reports/generated", "transparency_report.html")
+    return _send_report(REPORT_FILES["transparency"], "Transparency report not found. Please run the transparency analysis first.")
 
 
 @app.route("/data_quality_report")
 @login_required
 def view_data_quality_report():
-    report_file = "reports/generated/comprehensive_data_quality_report.html"
-    if not os.path.exists(report_file):
-        return "Data quality report not found. Please run the data quality analysis first.", 404
-    return send_from_directory("reports/generated", "comprehensive_data_quality_report.html")
+    return _send_report(REPORT_FILES["comprehensive_data_quality"], "Data quality report not found. Please run the data quality analysis first.")
 
 
 @app.route("/generate_test_data", methods=["POST"])
@@ -527,56 +624,24 @@ def generate_test_data():
             }), 400
         
         # Import the test data generator functions
-        from generator.testdata_generator import generate_test_data as gen_test_data
-        import pandas as pd
-        
-        # Define nationality distribution (copied from the generator file)
-        nationality_distribution = {
-            'DE': 0.7,  # 70% German
-            # EU countries (15%)
-            'TR': 0.04, # Turkey (largest immigrant group in Germany)
-            'PL': 0.03, # Poland
-            'IT': 0.02, # Italy
-            'RO': 0.02, # Romania
-            'GR': 0.01, # Greece
-            'HR': 0.01, # Croatia
-            'BG': 0.01, # Bulgaria
-            'ES': 0.01, # Spain
-            'FR': 0.01, # France
-            # Non-EU countries (15%)
-            'SY': 0.03, # Syria (large refugee population)
-            'RU': 0.02, # Russia
-            'UA': 0.02, # Ukraine
-            'US': 0.01, # United States
-            'CN': 0.01, # China
-            'IN': 0.01, # India
-            'VN': 0.01, # Vietnam
-            'IR': 0.01, # Iran
-            'AF': 0.01, # Afghanistan
-            'NG': 0.01, # Nigeria
-        }
+        from generator.testdata_generator import generate_test_columns, write_test_data_csv
         
         # Generate test data with the specified number of records
-        test_data = gen_test_data(
-            num_records=num_records, 
-            locales=['de_DE'], 
-            nationality_distribution=nationality_distribution
-        )
+        # Uses the generator's default nationality distribution
+        test_data = generate_test_columns(num_records=num_records, locales=['de_DE'])
         
-        # Create DataFrame and save to CSV
-        df = pd.DataFrame(test_data)
         output_path = 'data/testdata.csv'
         
         # Ensure the data directory exists
         os.makedirs('data', exist_ok=True)
         
-        # Save the DataFrame
-        df.to_csv(output_path, index=False)
+        # Save the records as CSV
+        write_test_data_csv(test_data, output_path)
         
         return jsonify({
             'success': True,
             'message': 'Test data generated successfully',
-            'records_count': len(test_data),
+            'records_count': len(test_data['name']),
             'file_path': output_path
         })
         
@@ -587,6 +652,18 @@ def generate_test_data():
         }), 500
 
 
+_KB = 1024
+_MB = 1024 * 1024
+
+def _format_size(num_bytes):
+    """Format a file size in bytes as a human-readable string"""
+    if num_bytes < _KB:
+        return f"{num_bytes} B"
+    if num_bytes < _MB:
+        return f"{num_bytes / _KB:.1f} KB"
+    return f"{num_bytes / _MB:.1f} MB"
+
+
 @app.route("/api/archives")
 @login_required
 def get_archives():
@@ -601,18 +678,17 @@ def get_archives():
         if not os.path.exists(archive_base_dir):
             return jsonify({"archives": []})
         
-        # Get all archive directories
-        archive_dirs = []
-        for item in os.listdir(archive_base_dir):
-            item_path = os.path.join(archive_base_dir, item)
-            if os.path.isdir(item_path) and item.startswith('archive_'):
-                archive_dirs.append(item)
+        # Get all archive directories; the DirEntry type check needs no extra stat
+        with os.scandir(archive_base_dir) as entries:
+            archive_dirs = [entry for entry in entries
+                            if entry.name.startswith('archive_') and entry.is_dir()]
         
         # Sort by creation time (newest first)
-        archive_dirs.sort(reverse=True)
+        archive_dirs.sort(key=lambda entry: entry.name, reverse=True)
         
-        for archive_dir in archive_dirs:
-            archive_path = os.path.join(archive_base_dir, archive_dir)
+        for archive_entry in archive_dirs:
+            archive_dir = archive_entry.name
+            archive_path = archive_entry.path
             
             # Extract timestamp from directory name
             timestamp_str = archive_dir.replace('archive_', '')
@@ -625,24 +701,17 @@ def get_archives():
             
             # Get list of reports in this archive
             reports = []
-            for file in os.listdir(archive_path):
-                if file.endswith('.html'):
-                    file_path = os.path.join(archive_path, file)
-                    file_size = os.path.getsize(file_path)
-                    
-                    # Format file size
-                    if file_size < 1024:
-                        size_str = f"{file_size} B"
-                    elif file_size < 1024 * 1024:
-                        size_str = f"{file_size / 1024:.1f} KB"
-                    else:
-                        size_str = f"{file_size / (1024 * 1024):.1f} MB"
-                    
-                    reports.append({
-                        "name": file,
-                        "size": size_str,
-                        "bytes": file_size
-                    })
+            total_size = 0
+            with os.scandir(archive_path) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.html'):
+                        file_size = entry.stat().st_size
+                        total_size += file_size
+                        reports.append({
+                            "name": entry.name,
+                            "size": _format_size(file_size),
+                            "bytes": file_size
+                        })
             
             # Sort reports by name for consistent display
             reports.sort(key=lambda x: x['name'])
@@ -653,7 +722,7 @@ def get_archives():
                     "date": formatted_date,
                     "timestamp": timestamp_str,
                     "reports": reports,
-                    "total_size": sum(r['bytes'] for r in reports)
+                    "total_size": total_size
                 })
         
         return jsonify({"archives": archives})
@@ -760,9 +829,10 @@ def change_password():
     form = ChangePasswordForm()
     if form.validate_on_submit():
         if current_user.check_password(form.current_password.data):
-            # Update password
-            current_user.password_hash = UserManager.hash_password(form.new_password.data)
-            UserManager.save_user(current_user)
+            # Update a copy; current_user only changes once the save has succeeded
+            user = current_user.copy()
+            user.password_hash = UserManager.hash_password(form.new_password.data)
+            UserManager.save_user(user)
             flash('Password changed successfully!', 'success')
             return redirect(url_for('profile'))
         else:
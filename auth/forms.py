@@ -37,10 +37,8 @@ class CreateUserForm(FlaskForm):
     
     def validate_username(self, username):
         """Check if username already exists"""
-        users = UserManager.get_all_users()
-        for user in users:
-            if user.username.lower() == username.data.lower():
-                raise ValidationError('Username already exists. Please choose a different one.')
+        if UserManager.get_user_by_username(username.data):
+            raise ValidationError('Username already exists. Please choose a different one.')
     
     def validate_confirm_password(self, confirm_password):
         """Check if passwords match"""
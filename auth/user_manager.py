@@ -5,9 +5,24 @@ Uses bcrypt for secure password hashing
 import bcrypt
 import os
 import json
+import orjson
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime, timedelta
+from flask import current_app, has_app_context
 from flask_login import UserMixin
 import secrets
+from utils.logger import setup_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only
+    fcntl = None
+
+logger = setup_logger("user_manager", "results/logs/user_manager.log")
 
 class User(UserMixin):
     """User class for Flask-Login"""
@@ -50,43 +65,193 @@ class User(UserMixin):
             last_login=data.get('last_login'),
             is_admin=data.get('is_admin', False)
         )
+    
+    def copy(self):
+        """Return a detached copy, so edits never reach the shared user cache"""
+        return User.from_dict(self.to_dict())
 
 class UserManager:
     """Manages user authentication and storage"""
     
     USERS_FILE = 'auth/users.json'
+    # Single-user changes are appended here and folded into USERS_FILE on compaction
+    USERS_LOG = 'auth/users.log'
+    # flock'd around every read-modify-write so gunicorn workers don't lose each other's changes
+    LOCK_FILE = 'auth/users.lock'
+    # The log is compacted once it outgrows the users file, but never below this size
+    COMPACT_MIN_LOG_SIZE = 64 * 1024
+    
+    # Parsed users are cached and invalidated when either file's mtime/size changes
+    _cache = None
+    _cache_stamp = None
+    _username_index = {}
+    _lock = threading.RLock()
+    _lock_file = None
+    _lock_depth = 0
+    
+    # Failed logins allowed per (username, address) within the window before bcrypt is skipped.
+    # Failures are counted per process, so with N gunicorn workers up to N times as many get through.
+    LOGIN_ATTEMPT_LIMIT = 5
+    LOGIN_ATTEMPT_WINDOW = 60  # seconds
+    # Tracked (username, address) pairs; the least recently failed pair is evicted beyond this
+    LOGIN_FAILURE_KEYS_MAX = 10000
+    _login_failures = OrderedDict()
+    _login_lock = threading.Lock()
+    
+    @staticmethod
+    def _stat(path):
+        """Return (mtime_ns, size) of a file, or None if it is missing"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    @staticmethod
+    def _file_stamp():
+        """Return the combined stamp of the users file and its change log"""
+        return UserManager._stat(UserManager.USERS_FILE), UserManager._stat(UserManager.USERS_LOG)
+    
+    @staticmethod
+    def _set_cache(users, stamp):
+        """Store parsed users and rebuild the lowercase username index"""
+        UserManager._cache = users
+        UserManager._cache_stamp = stamp
+        UserManager._get_user_cached.cache_clear()
+        UserManager._username_index = {user.username.lower(): uid for uid, user in users.items()}
+    
+    @staticmethod
+    def _copy_users(users):
+        """Copy cached users so callers can mutate what they get back"""
+        return {uid: user.copy() for uid, user in users.items()}
     
     @staticmethod
     def _ensure_auth_dir():
         """Ensure auth directory exists"""
         os.makedirs('auth', exist_ok=True)
     
+    @staticmethod
+    @contextmanager
+    def _file_lock():
+        """Hold the thread lock and an exclusive flock on LOCK_FILE; re-entrant within a process"""
+        with UserManager._lock:
+            if UserManager._lock_depth == 0 and fcntl is not None:
+                UserManager._ensure_auth_dir()
+                UserManager._lock_file = open(UserManager.LOCK_FILE, 'a')
+                fcntl.flock(UserManager._lock_file, fcntl.LOCK_EX)
+            UserManager._lock_depth += 1
+            try:
+                yield
+            finally:
+                UserManager._lock_depth -= 1
+                if UserManager._lock_depth == 0 and UserManager._lock_file is not None:
+                    fcntl.flock(UserManager._lock_file, fcntl.LOCK_UN)
+                    UserManager._lock_file.close()
+                    UserManager._lock_file = None
+    
+    @staticmethod
+    def _apply_event(users, event):
+        """Apply a single logged change to a dict of users"""
+        if event['op'] == 'delete':
+            users.pop(event['id'], None)
+        else:
+            users[event['id']] = User.from_dict(event['user'])
+    
     @staticmethod
     def _load_users():
-        """Load users from JSON file"""
-        UserManager._ensure_auth_dir()
-        if not os.path.exists(UserManager.USERS_FILE):
-            return {}
+        """Load users from the JSON file and replay the change log"""
+        with UserManager._lock:
+            stamp = UserManager._file_stamp()
+            if stamp == (None, None):
+                UserManager._ensure_auth_dir()
+                return {}
+            if UserManager._cache is not None and stamp == UserManager._cache_stamp:
+                return UserManager._copy_users(UserManager._cache)
         
-        try:
-            with open(UserManager.USERS_FILE, 'r') as f:
-                data = json.load(f)
-                return {uid: User.from_dict(user_data) for uid, user_data in data.items()}
-        except (json.JSONDecodeError, KeyError, FileNotFoundError):
-            return {}
+        # Another worker may be compacting; read both files under the file lock
+        with UserManager._file_lock():
+            stamp = UserManager._file_stamp()
+            try:
+                users = {}
+                if stamp[0] is not None:
+                    with open(UserManager.USERS_FILE, 'rb') as f:
+                        data = orjson.loads(f.read())
+                        users = {uid: User.from_dict(user_data) for uid, user_data in data.items()}
+                if stamp[1] is not None:
+                    with open(UserManager.USERS_LOG, 'rb') as f:
+                        for line_number, line in enumerate(f, start=1):
+                            try:
+                                event = orjson.loads(line)
+                            except json.JSONDecodeError:
+                                # Torn line from an interrupted append
+                                logger.warning(f"Skipping unreadable line {line_number} in {UserManager.USERS_LOG}")
+                                continue
+                            UserManager._apply_event(users, event)
+            except (json.JSONDecodeError, KeyError, FileNotFoundError):
+                return {}
+            
+            UserManager._set_cache(users, stamp)
+            return UserManager._copy_users(users)
     
     @staticmethod
     def _save_users(users):
-        """Save users to JSON file"""
+        """Write all users to the JSON file and reset the change log"""
         UserManager._ensure_auth_dir()
         data = {uid: user.to_dict() for uid, user in users.items()}
-        with open(UserManager.USERS_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        with UserManager._file_lock():
+            tmp_path = UserManager.USERS_FILE + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(data))
+            os.replace(tmp_path, UserManager.USERS_FILE)
+            if os.path.exists(UserManager.USERS_LOG):
+                os.remove(UserManager.USERS_LOG)
+            UserManager._set_cache(dict(users), UserManager._file_stamp())
+    
+    @staticmethod
+    def _append_event(op, user_id, user=None):
+        """Append a single-user change to the log instead of rewriting the users file"""
+        UserManager._ensure_auth_dir()
+        event = {'op': op, 'id': user_id}
+        if user is not None:
+            event['user'] = user.to_dict()
+        
+        with UserManager._file_lock():
+            cache_fresh = (UserManager._cache is not None
+                           and UserManager._file_stamp() == UserManager._cache_stamp)
+            with open(UserManager.USERS_LOG, 'a+b') as f:
+                # An append interrupted by a crash leaves a tail with no newline; end it first
+                # so this event isn't merged into that torn line and dropped on the next load
+                record = orjson.dumps(event) + b'\n'
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        record = b'\n' + record
+                f.write(record)
+            
+            if cache_fresh:
+                users = dict(UserManager._cache)
+                UserManager._apply_event(users, event)
+                UserManager._set_cache(users, UserManager._file_stamp())
+            else:
+                UserManager._cache = None
+            
+            users_stat, log_stat = UserManager._file_stamp()
+            if users_stat is None or log_stat[1] > max(users_stat[1], UserManager.COMPACT_MIN_LOG_SIZE):
+                UserManager.compact()
+    
+    @staticmethod
+    def compact():
+        """Fold the change log into the users file"""
+        with UserManager._file_lock():
+            if UserManager._stat(UserManager.USERS_LOG) is None:
+                return
+            UserManager._save_users(UserManager._load_users())
     
     @staticmethod
     def hash_password(password):
         """Hash a password using bcrypt"""
-        salt = bcrypt.gensalt()
+        rounds = current_app.config.get('BCRYPT_ROUNDS', 12) if has_app_context() else 12
+        salt = bcrypt.gensalt(rounds=rounds)
         return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
     
     @staticmethod
@@ -95,9 +260,8 @@ class UserManager:
         users = UserManager._load_users()
         
         # Check if username already exists
-        for user in users.values():
-            if user.username.lower() == username.lower():
-                return None, "Username already exists"
+        if UserManager.get_user_by_username(username):
+            return None, "Username already exists"
         
         # Generate unique user ID
         user_id = secrets.token_hex(8)
@@ -116,37 +280,84 @@ class UserManager:
         )
         
         # Save user
-        users[user_id] = user
-        UserManager._save_users(users)
+        UserManager._append_event('upsert', user_id, user)
         
         return user, "User created successfully"
     
     @staticmethod
-    def authenticate_user(username, password):
+    def _recent_failures(key, now):
+        """Drop failures older than the window and return the remaining deque"""
+        failures = UserManager._login_failures.get(key, deque())
+        cutoff = now - UserManager.LOGIN_ATTEMPT_WINDOW
+        while failures and failures[0] <= cutoff:
+            failures.popleft()
+        return failures
+    
+    @staticmethod
+    def _record_failure(key):
+        """Record a failed login, keeping the dict bounded by LRU eviction"""
+        now = time.monotonic()
+        failures = UserManager._recent_failures(key, now)
+        failures.append(now)
+        UserManager._login_failures[key] = failures
+        UserManager._login_failures.move_to_end(key)
+        while len(UserManager._login_failures) > UserManager.LOGIN_FAILURE_KEYS_MAX:
+            UserManager._login_failures.popitem(last=False)
+    
+    @staticmethod
+    def is_login_throttled(username, remote_addr=None):
+        """Check whether too many recent logins failed for this username and address"""
+        key = (username.lower(), remote_addr)
+        with UserManager._login_lock:
+            if key not in UserManager._login_failures:
+                return False
+            failures = UserManager._recent_failures(key, time.monotonic())
+            if not failures:
+                del UserManager._login_failures[key]
+                return False
+            return len(failures) >= UserManager.LOGIN_ATTEMPT_LIMIT
+    
+    @staticmethod
+    def authenticate_user(username, password, remote_addr=None):
         """Authenticate user with username and password"""
-        users = UserManager._load_users()
+        if UserManager.is_login_throttled(username, remote_addr):
+            return None
         
-        for user in users.values():
-            if user.username.lower() == username.lower():
-                if user.check_password(password):
-                    user.update_last_login()
-                    return user
-                return None
+        key = (username.lower(), remote_addr)
+        user = UserManager.get_user_by_username(username)
+        if user and user.check_password(password):
+            with UserManager._login_lock:
+                UserManager._login_failures.pop(key, None)
+            user.update_last_login()
+            return user
         
+        with UserManager._login_lock:
+            UserManager._record_failure(key)
         return None
     
     @staticmethod
     def get_user(user_id):
         """Get user by ID"""
-        users = UserManager._load_users()
-        return users.get(user_id)
+        user = UserManager._get_user_cached(user_id, UserManager._file_stamp())
+        return user.copy() if user is not None else None
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _get_user_cached(user_id, stamp):
+        """Resolve a user once per users-file version; Flask-Login calls get_user on every request"""
+        return UserManager._load_users().get(user_id)
+    
+    @staticmethod
+    def get_user_by_username(username):
+        """Get user by case-insensitive username"""
+        with UserManager._lock:
+            users = UserManager._load_users()
+            return users.get(UserManager._username_index.get(username.lower()))
     
     @staticmethod
     def save_user(user):
         """Save/update a user"""
-        users = UserManager._load_users()
-        users[user.id] = user
-        UserManager._save_users(users)
+        UserManager._append_event('upsert', user.id, user)
     
     @staticmethod
     def get_all_users():
@@ -158,8 +369,7 @@ class UserManager:
         """Delete a user"""
         users = UserManager._load_users()
         if user_id in users:
-            del users[user_id]
-            UserManager._save_users(users)
+            UserManager._append_event('delete', user_id)
             return True
         return False
     
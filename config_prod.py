@@ -20,9 +20,22 @@ class Config:
     ARCHIVE_DIR = 'reports/archive'
     DATA_DIR = 'data'
     RESULTS_DIR = 'results/responses'
+
+    # Hand report downloads to a fronting proxy instead of streaming them from a worker.
+    # USE_X_SENDFILE suits Apache/lighttpd; REPORTS_ACCEL_PREFIX is an nginx internal location
+    # aliased to REPORTS_DIR (e.g. /internal_reports/). Both stay off on Render, which has no proxy.
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', 'false').lower() == 'true'
+    REPORTS_ACCEL_PREFIX = os.environ.get('REPORTS_ACCEL_PREFIX')
+    
+    # Number of reverse proxies whose X-Forwarded-For/-Proto headers are trusted. Render's
+    # router counts as one; set 0 only when clients connect to gunicorn directly.
+    TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT', 1))
     
     # Session settings
     PERMANENT_SESSION_LIFETIME = 3600  # 1 hour
     SESSION_COOKIE_SECURE = True  # Only send cookies over HTTPS in production
     SESSION_COOKIE_HTTPONLY = True  # Prevent XSS
     SESSION_COOKIE_SAMESITE = 'Lax'  # CSRF protection
+    
+    # Password hashing cost (bcrypt log rounds); keep at 12+ in production
+    BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
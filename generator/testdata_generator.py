@@ -1,216 +1,339 @@
 # generator/testdata_generator.py
 
+import csv
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 from faker import Faker
-import random
+from faker.providers.address import Provider as AddressProvider
 
 
 # Define the URLs for the forenames and surnames CSV files
 forenames_url = "https://raw.githubusercontent.com/sigpwned/popular-names-by-country-dataset/main/common-forenames-by-country.csv"
 surnames_url = "https://raw.githubusercontent.com/sigpwned/popular-names-by-country-dataset/main/common-surnames-by-country.csv"
 
-# Load the data from each URL into two separate pandas DataFrames
-df_forenames = pd.read_csv(forenames_url)
-df_surnames = pd.read_csv(surnames_url)
-
-# Rename 'Romanized Name' to 'Name' for consistency
-df_forenames.rename(columns={'Romanized Name': 'Name'}, inplace=True)
-df_surnames.rename(columns={'Romanized Name': 'Name'}, inplace=True)
-
-
-forenames_by_country_gender = df_forenames.groupby(['Country', 'Gender'])['Name'].apply(list).to_dict()
-surnames_by_country = df_surnames.groupby('Country')['Name'].apply(list).to_dict()
-
-
-def generate_random_person(forenames_by_country_gender, surnames_by_country, nationality_distribution):
-    """Generates a random person with full name, nationality, and gender based on distribution."""
-
-    # Select nationality based on the provided distribution
-    nationality = random.choices(list(nationality_distribution.keys()), weights=nationality_distribution.values(), k=1)[0]
-
-
-    countries = list(surnames_by_country.keys())
-    # while True:
-    #     nationality = random.choice(countries)
-    gender = random.choice(['M', 'F'])
-    #    if (nationality, gender) in forenames_by_country_gender and surnames_by_country.get(nationality):
-    #        break
+# Processed name tables are cached here so the CSVs are downloaded and grouped only once
+names_cache_dir = os.environ.get('NAMES_CACHE_DIR', os.path.expanduser('~/.cache/credit_scoring_names'))
+
+
+@lru_cache(maxsize=1)
+def load_name_tables():
+    """Returns forenames by (country, gender) and surnames by country, cached on disk.
+
+    Loaded on first use rather than at import, so importing this module is cheap.
+    """
+    cache_path = os.path.join(names_cache_dir, 'name_tables.pkl')
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    # Load the data from each URL into two separate pandas DataFrames
+    df_forenames = pd.read_csv(forenames_url)
+    df_surnames = pd.read_csv(surnames_url)
+
+    # Rename 'Romanized Name' to 'Name' for consistency
+    df_forenames.rename(columns={'Romanized Name': 'Name'}, inplace=True)
+    df_surnames.rename(columns={'Romanized Name': 'Name'}, inplace=True)
+
+    name_tables = (
+        df_forenames.groupby(['Country', 'Gender'])['Name'].apply(list).to_dict(),
+        df_surnames.groupby('Country')['Name'].apply(list).to_dict(),
+    )
+
+    try:
+        os.makedirs(names_cache_dir, exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(name_tables, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: Could not cache name tables in {names_cache_dir}: {e}")
+    return name_tables
+
+
+# Categorical distributions as (value, weight) pairs
+employment_status_distribution_by_age = [
+    # (upper age bound, distribution)
+    (60, [
+        ('employed', 0.80),
+        ('unemployed', 0.05),
+        ('self_employed', 0.10),
+        ('student', 0.05),
+        ('retired', 0.0) # Very low chance of being retired at young age
+    ]),
+    (65, [
+        ('employed', 0.68),
+        ('unemployed', 0.05),
+        ('self_employed', 0.10),
+        ('student', 0.02),
+        ('retired', 0.15) # Increased chance of being retired
+    ]),
+    (81, [
+        ('employed', 0.09),
+        ('unemployed', 0.02),
+        ('self_employed', 0.03),
+        ('student', 0.01),
+        ('retired', 0.85) # High chance of being retired at older age
+    ]),
+]
+payment_defaults_distribution = [(0, 0.8), (1, 0.1), (2, 0.05), (3, 0.05)]
+credit_inquiries_distribution = [(0, 0.4), (1, 0.25), (2, 0.15), (3, 0.1), (4, 0.05), (5, 0.03), (6, 0.02)]
+housing_status_distribution = [('owner', 0.45), ('renter', 0.45), ('subsidized_housing', 0.05), ('living_with_parents', 0.05)]
+household_size_distribution = [(1, 0.3), (2, 0.3), (3, 0.2), (4, 0.1), (5, 0.05), (6, 0.03), (7, 0.02)]
+disability_status_distribution = [('none',0.9), ('registered_disability',0.04), ('severe_disability',0.06)]
+education_level_distribution = [
+    ('no_formal_education', 0.02), 
+    ('lower_secondary_education', 0.15), 
+    ('intermediate_secondary_education', 0.25), 
+    ('upper_secondary_education', 0.20), 
+    ('vocational_training', 0.25), 
+    ('bachelor_degree', 0.08), 
+    ('master_degree', 0.04), 
+    ('doctoral_degree', 0.01)
+]
+marital_status_distribution = [('single', 0.30), ('married', 0.47), ('registered_partnership', 0.06), ('divorced', 0.10), ('widowed', 0.07)]
+
+
+@dataclass(frozen=True, slots=True)
+class CategoricalDistribution:
+    """Values and cumulative weights of a categorical distribution, built once from (value, weight) pairs."""
+    values: np.ndarray
+    cdf: np.ndarray
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        values, weights = zip(*pairs)
+        return cls(np.asarray(values), np.cumsum(weights, dtype=float))
+
+    def sample(self, rng, size):
+        """Draws `size` values by binary search on the cumulative weights."""
+        return self.values[np.searchsorted(self.cdf, rng.random(size) * self.cdf[-1], side='right')]
+
+
+def group_indices(*keys):
+    """Yields (key, record indices) for every distinct key, using one stable sort instead of a mask per key.
+
+    With several key arrays the key is a tuple of their values, e.g. (nationality, gender).
+    """
+    uniques, codes = [], 0
+    for key in keys:
+        unique_values, inverse = np.unique(key, return_inverse=True)
+        uniques.append(unique_values)
+        codes = codes * len(unique_values) + inverse
+    unique_codes, inverse = np.unique(codes, return_inverse=True)
+    order = np.argsort(inverse, kind='stable')
+    bounds = np.cumsum(np.bincount(inverse, minlength=len(unique_codes)))
+    for code, indices in zip(unique_codes.tolist(), np.split(order, bounds[:-1])):
+        key = []
+        for unique_values in reversed(uniques):
+            code, position = divmod(code, len(unique_values))
+            key.append(unique_values[position])
+        yield (tuple(reversed(key)) if len(keys) > 1 else key[0]), indices
+
+
+# Lookup tables for the fixed distributions, built once at import
+# Employment status: one normalized CDF row per age band, all bands sharing the same status order
+employment_status_values = np.asarray([status for status, _ in employment_status_distribution_by_age[0][1]])
+employment_status_age_bounds = np.asarray([upper_age for upper_age, _ in employment_status_distribution_by_age[:-1]])
+employment_status_cdfs = np.asarray([np.cumsum([weight for _, weight in distribution]) / sum(weight for _, weight in distribution)
+                                     for _, distribution in employment_status_distribution_by_age])
+employment_status_not_working = np.isin(employment_status_values, ['retired', 'student', 'unemployed'])
+payment_defaults_table = CategoricalDistribution.from_pairs(payment_defaults_distribution)
+credit_inquiries_table = CategoricalDistribution.from_pairs(credit_inquiries_distribution)
+housing_status_table = CategoricalDistribution.from_pairs(housing_status_distribution)
+household_size_table = CategoricalDistribution.from_pairs(household_size_distribution)
+disability_status_table = CategoricalDistribution.from_pairs(disability_status_distribution)
+education_level_table = CategoricalDistribution.from_pairs(education_level_distribution)
+marital_status_table = CategoricalDistribution.from_pairs(marital_status_distribution)
+
+
+def uniform_upto(rng, upper):
+    """Draws one integer from [0, upper] for every element of `upper`."""
+    return rng.integers(0, upper + 1)
+
+
+def generate_postcodes(fake, rng, size):
+    """Draws `size` postcodes, zero-padded to at least 5 digits.
+
+    Locales whose only postcode format is all digits (e.g. de_DE's '#####') are
+    drawn in one NumPy call; any other format goes through Faker per record.
+    """
+    # Only safe to bypass Faker when a single locale uses the stock format-based postcode()
+    provider = getattr(fake.postcode, '__self__', None) if len(fake.locales) == 1 else None
+    formats = ()
+    if isinstance(provider, AddressProvider) and type(provider).postcode is AddressProvider.postcode:
+        formats = provider.postcode_formats
+    if len(formats) == 1 and set(formats[0]) == {'#'}:
+        width = len(formats[0])
+        digits = rng.integers(0, 10 ** width, size=size).astype(str)
+        return np.char.zfill(digits, max(width, 5)).tolist()
+    return [fake.postcode().zfill(5) for _ in range(size)]
+
+
+@lru_cache(maxsize=1)
+def name_index():
+    """Returns name arrays and the usable nationalities per gender, derived once from the name tables."""
+    forenames_by_country_gender, surnames_by_country = load_name_tables()
+    # Only keep forenames for nationalities that also have surnames, so one lookup validates a pair
+    forenames = {(nat, gender): np.asarray(names, dtype=object)
+                 for (nat, gender), names in forenames_by_country_gender.items() if nat in surnames_by_country}
+    surnames = {nat: np.asarray(names, dtype=object) for nat, names in surnames_by_country.items()}
+    valid_nationalities = {gender: np.asarray([nat for nat in surnames if (nat, gender) in forenames], dtype=object)
+                           for gender in ('M', 'F')}
+    return forenames, surnames, valid_nationalities
+
+
+def generate_random_people(num_records, nationality_distribution, rng):
+    """Generates full-name, nationality and gender arrays for `num_records` people based on distribution."""
+    forenames, surnames, valid_nationalities = name_index()
+
+    # Select nationality based on the provided distribution, defaulting to the module's German mix
+    if nationality_distribution is None:
+        table = default_nationality_table
+    else:
+        table = CategoricalDistribution.from_pairs(nationality_distribution.items())
+    nationality = table.sample(rng, num_records).astype(object)
+    gender = rng.choice(np.array(['M', 'F'], dtype=object), size=num_records)
+    keep = np.ones(num_records, dtype=bool)
 
     # Ensure selected nationality exists in name data, otherwise fallback
-    if (nationality, gender) not in forenames_by_country_gender or nationality not in surnames_by_country:
-        # Fallback to a nationality that exists in the data if the selected one doesn't
-        valid_nationalities = [nat for nat in countries if (nat, gender) in forenames_by_country_gender and nat in surnames_by_country]
-        if valid_nationalities:
-            nationality = random.choice(valid_nationalities)
-        else:
-             # If no valid nationality is found for the chosen gender, try the other gender
-            gender = 'F' if gender == 'M' else 'M'
-            valid_nationalities = [nat for nat in countries if (nat, gender) in forenames_by_country_gender and nat in surnames_by_country]
-            if valid_nationalities:
-                 nationality = random.choice(valid_nationalities)
-            else:
-                 # If still no valid nationality, return None or raise an error
-                 return None # Or handle this case as needed
-
-
-    forename = random.choice(forenames_by_country_gender[(nationality, gender)])
-    surname = random.choice(surnames_by_country[nationality])
-    full_name = f"{forename} {surname}"
-
-    return {
-        'full_name': full_name,
-        'nationality': nationality,
-        'gender': 'male' if gender == 'M' else 'female' # Map 'M'/'F' to 'male'/'female'
-    }
-
-
-
-def generate_test_data(num_records=1, locales=['de_DE'], nationality_distribution=None):
-    """Generates a list of dictionaries with fake data based on a predefined structure."""
+    for (nat, sex), group in group_indices(nationality, gender):
+        if (nat, sex) in forenames:
+            continue
+        if not len(valid_nationalities[sex]):
+            # If no valid nationality is found for the chosen gender, try the other gender
+            sex = 'F' if sex == 'M' else 'M'
+            if not len(valid_nationalities[sex]):
+                keep[group] = False # Drop these records
+                continue
+            gender[group] = sex
+        nationality[group] = rng.choice(valid_nationalities[sex], size=len(group))
+
+    nationality, gender = nationality[keep], gender[keep]
+    forename = np.empty(len(nationality), dtype=object)
+    surname = np.empty(len(nationality), dtype=object)
+    # Name arrays are indexed in bulk per (nationality, gender) group
+    for (nat, sex), group in group_indices(nationality, gender):
+        forename_choices = forenames[(nat, sex)]
+        surname_choices = surnames[nat]
+        forename[group] = forename_choices[rng.integers(len(forename_choices), size=len(group))]
+        surname[group] = surname_choices[rng.integers(len(surname_choices), size=len(group))]
+
+    full_name = forename + ' ' + surname
+    gender = np.where(gender == 'M', 'male', 'female').astype(object) # Map 'M'/'F' to 'male'/'female'
+    return full_name, nationality, gender
+
+
+
+# Below this many records a single process is faster than starting a worker pool
+parallel_min_records = 20000
+
+
+def generate_test_columns_chunk(args):
+    """Generates one chunk of columns in a worker process."""
+    num_records, locales, nationality_distribution, seed = args
+    return generate_test_columns(num_records, locales, nationality_distribution, seed=seed, workers=1)
+
+
+def generate_test_columns(num_records=1, locales=['de_DE'], nationality_distribution=None, seed=None, workers=None):
+    """Generates fake test data as a dict of equally long column arrays.
+
+    `nationality_distribution` defaults to the module-level distribution.
+    Every column is drawn for all records at once with NumPy, including postal
+    codes for digit-only locale formats. Large requests are split across `workers`
+    processes (default: one per CPU), each with its own seed derived from `seed`.
+    """
+    seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and num_records >= parallel_min_records:
+        chunk_sizes = [num_records // workers + (i < num_records % workers) for i in range(workers)]
+        chunks = [(size, locales, nationality_distribution, child_seed)
+                  for size, child_seed in zip(chunk_sizes, seed_sequence.spawn(workers))]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(generate_test_columns_chunk, chunks))
+        return {column: np.concatenate([part[column] for part in parts]) for column in parts[0]}
+
     fake = Faker(locales)
-    data = []
-    for _ in range(num_records):
-        record = {}
-
-        # Use generate_random_person to get name, nationality, and gender
-        person_data = generate_random_person(forenames_by_country_gender, surnames_by_country, nationality_distribution)
-
-        # Handle the case where generate_random_person returns None
-        if person_data is None:
-            continue # Skip this record if no valid nationality was found
-
-
-        record["name"] = person_data['full_name']
-        record["gender"] = person_data['gender']
-        
-        # Randomly change about 1.5% of people to non_binary
-        if random.random() < 0.015:
-            record["gender"] = "non_binary"
-        
-        record["nationality"] = person_data['nationality']
-        nationality = record["nationality"]
-        possible_ethnicities = nationality_ethnicity_mapping.get(nationality, [('other', 1.0)]) # Default to 'other' if nationality not in map
-        ethnicity_choices, weights = zip(*possible_ethnicities)
-        record["ethnicity"] = random.choices(ethnicity_choices, weights=weights, k=1)[0]
-
-        record["age"] = fake.random_int(min=18, max=80)
-        # Adjust mean income based on age
-        base_mean_income = 20000
-        age_effect = (record["age"] - 18) * 2000  # Simple linear increase with age
-        mean_income = base_mean_income + age_effect
-        std_dev_income = 15000 # Example standard deviation (reduced for potentially less spread)
-
-        generated_income = int(random.gauss(mean_income, std_dev_income))
-        # Ensure income is within the desired range
-        record["income"] = max(20000, min(150000, generated_income))
-
-
-        # Adjust employment status distribution based on age
-        age = record["age"]
-        if age < 60:
-            employment_status_distribution = [
-                ('employed', 0.80),
-                ('unemployed', 0.05),
-                ('self_employed', 0.10),
-                ('student', 0.05),
-                ('retired', 0.0) # Very low chance of being retired at young age
-            ]
-        elif age < 65:
-             employment_status_distribution = [
-                ('employed', 0.68),
-                ('unemployed', 0.05),
-                ('self_employed', 0.10),
-                ('student', 0.02),
-                ('retired', 0.15) # Increased chance of being retired
-            ]
-        else:
-             employment_status_distribution = [
-                ('employed', 0.09),
-                ('unemployed', 0.02),
-                ('self_employed', 0.03),
-                ('student', 0.01),
-                ('retired', 0.85) # High chance of being retired at older age
-            ]
-
-
-        statuses, weights = zip(*employment_status_distribution)
-        record["employment_status"] = random.choices(statuses, weights=weights, k=1)[0]
-
-        record["existing_loans"] = fake.random_int(min=0, max=5)
-
-        # Generate loan_amount using a Gaussian distribution and ensure it's within the range
-        if record["existing_loans"] > 0:
-            # Adjust mean loan amount based on the number of existing loans
-            mean_loan_amount = 5000 + (record["existing_loans"] * 3000) # Increase mean loan amount with more loans
-            std_dev_loan_amount = 5000 # Example standard deviation
-            generated_loan_amount = int(random.gauss(mean_loan_amount, std_dev_loan_amount))
-            # Ensure loan_amount is within the desired range
-            record["loan_amount"] = max(500, min(50000, generated_loan_amount))
-        else:
-            record["loan_amount"] = 0
-
-
-        record["credit_limit"] = fake.random_int(min=0, max=100000)
-        record["used_credit"] = fake.random_int(min=0, max=record["credit_limit"]) # Ensure used_credit <= credit_limit
-
-        # Use random.choices for weighted selection of payment_defaults
-        payment_defaults_distribution = [(0, 0.8), (1, 0.1), (2, 0.05), (3, 0.05)]
-        defaults, weights = zip(*payment_defaults_distribution)
-        record["payment_defaults"] = random.choices(defaults, weights=weights, k=1)[0]
-
-        # Use random.choices for weighted selection of credit_inquiries_last_6_months
-        credit_inquiries_distribution = [(0, 0.4), (1, 0.25), (2, 0.15), (3, 0.1), (4, 0.05), (5, 0.03), (6, 0.02)]
-        inquiries, weights = zip(*credit_inquiries_distribution)
-        record["credit_inquiries_last_6_months"] = random.choices(inquiries, weights=weights, k=1)[0]
-
-        # Use random.choices for weighted selection of housing_status
-        housing_status_distribution = [('owner', 0.45), ('renter', 0.45), ('subsidized_housing', 0.05), ('living_with_parents', 0.05)]
-        housing_statuses, weights = zip(*housing_status_distribution)
-        record["housing_status"] = random.choices(housing_statuses, weights=weights, k=1)[0]
-
-        record["address_stability_years"] = fake.random_int(min=0, max=record["age"]) # Ensure address_stability_years <= age
-        # Use random.choices for weighted selection of household_size
-        household_size_distribution = [(1, 0.3), (2, 0.3), (3, 0.2), (4, 0.1), (5, 0.05), (6, 0.03), (7, 0.02)]
-        household_sizes, weights = zip(*household_size_distribution)
-        record["household_size"] = random.choices(household_sizes, weights=weights, k=1)[0]
-
-
-        # Ensure employment_duration_years <= age - 16 (approximate working age start)
-        # Set employment duration to 0 for retired, students, and unemployed
-        if record["employment_status"] in ['retired', 'student', 'unemployed']:
-            record["employment_duration_years"] = 0
-        else:
-            record["employment_duration_years"] = fake.random_int(min=0, max=record["age"]-16 if record["age"] >= 16 else 0)
-
-        # Use random.choices for weighted selection of disability_status
-        disability_status_distribution = [('none',0.9), ('registered_disability',0.04), ('severe_disability',0.06)]
-        disability_statuses, weights = zip(*disability_status_distribution)
-        record["disability_status"] = random.choices(disability_statuses, weights=weights, k=1)[0]
-
-        # Use random.choices for weighted selection of education_level
-        education_level_distribution = [
-            ('no_formal_education', 0.02), 
-            ('lower_secondary_education', 0.15), 
-            ('intermediate_secondary_education', 0.25), 
-            ('upper_secondary_education', 0.20), 
-            ('vocational_training', 0.25), 
-            ('bachelor_degree', 0.08), 
-            ('master_degree', 0.04), 
-            ('doctoral_degree', 0.01)
-        ]
-        education_levels, weights = zip(*education_level_distribution)
-        record["education_level"] = random.choices(education_levels, weights=weights, k=1)[0]
-
-        # Use random.choices for weighted selection of marital_status
-        marital_status_distribution = [('single', 0.30), ('married', 0.47), ('registered_partnership', 0.06), ('divorced', 0.10), ('widowed', 0.07)]
-        marital_statuses, weights = zip(*marital_status_distribution)
-        record["marital_status"] = random.choices(marital_statuses, weights=weights, k=1)[0]
-
-        record["postal_code"] = fake.postcode().zfill(5)  # Ensure 5 digits with leading zeros
-        record["language_preference"] = 'de'
-
-        data.append(record)
-    return data
+    fake.seed_instance(int(seed_sequence.generate_state(1)[0]))
+    rng = np.random.default_rng(seed_sequence)
+
+    # Records without any valid name data are dropped, so n may be below num_records
+    full_name, nationality, gender = generate_random_people(num_records, nationality_distribution, rng)
+    n = len(full_name)
+    record = {}
+
+    record["name"] = full_name
+    record["gender"] = gender
+    # Randomly change about 1.5% of people to non_binary
+    record["gender"][rng.random(n) < 0.015] = "non_binary"
+
+    record["nationality"] = nationality
+    record["ethnicity"] = np.empty(n, dtype=object)
+    for nationality, indices in group_indices(record["nationality"]):
+        ethnicity_table = ethnicity_tables.get(nationality, default_ethnicity_table) # Default to 'other' if nationality not in map
+        record["ethnicity"][indices] = ethnicity_table.sample(rng, len(indices))
+
+    age = rng.integers(18, 81, size=n)
+    record["age"] = age
+    # Adjust mean income based on age with a simple linear increase
+    mean_income = 20000 + (age - 18) * 2000
+    std_dev_income = 15000 # Example standard deviation (reduced for potentially less spread)
+    # Ensure income is within the desired range
+    record["income"] = rng.normal(mean_income, std_dev_income).clip(20000, 150000).astype(np.int32)
+
+    # Adjust employment status distribution based on age: pick each record's band CDF and invert it
+    age_band = np.searchsorted(employment_status_age_bounds, age, side='right')
+    employment_status_codes = (rng.random(n)[:, None] < employment_status_cdfs[age_band]).argmax(axis=1)
+    record["employment_status"] = employment_status_values[employment_status_codes]
+
+    existing_loans = rng.integers(0, 6, size=n)
+    record["existing_loans"] = existing_loans
+    # Mean loan amount increases with more loans; no loans means no loan amount
+    mean_loan_amount = 5000 + existing_loans * 3000
+    loan_amount = rng.normal(mean_loan_amount, 5000).clip(500, 50000).astype(np.int32)
+    record["loan_amount"] = np.where(existing_loans > 0, loan_amount, 0)
+
+    record["credit_limit"] = rng.integers(0, 100001, size=n)
+    record["used_credit"] = uniform_upto(rng, record["credit_limit"]) # Ensure used_credit <= credit_limit
+
+    record["payment_defaults"] = payment_defaults_table.sample(rng, n)
+    record["credit_inquiries_last_6_months"] = credit_inquiries_table.sample(rng, n)
+    record["housing_status"] = housing_status_table.sample(rng, n)
+    record["address_stability_years"] = uniform_upto(rng, age) # Ensure address_stability_years <= age
+    record["household_size"] = household_size_table.sample(rng, n)
+
+    # Ensure employment_duration_years <= age - 16 (approximate working age start)
+    # Set employment duration to 0 for retired, students, and unemployed
+    not_working = employment_status_not_working[employment_status_codes]
+    record["employment_duration_years"] = np.where(not_working, 0, uniform_upto(rng, age - 16))
+
+    record["disability_status"] = disability_status_table.sample(rng, n)
+    record["education_level"] = education_level_table.sample(rng, n)
+    record["marital_status"] = marital_status_table.sample(rng, n)
+
+    record["postal_code"] = np.asarray(generate_postcodes(fake, rng, n), dtype=object)  # Ensure 5 digits with leading zeros
+    record["language_preference"] = np.full(n, 'de', dtype=object)
+
+    return record
+
+
+def generate_test_data(num_records=1, locales=['de_DE'], nationality_distribution=None, seed=None, workers=None):
+    """Generates a list of dictionaries with fake data based on a predefined structure.
+
+    Takes the same arguments as generate_test_columns; prefer that function when
+    the records are only written out, as it skips building one dict per record.
+    """
+    columns = generate_test_columns(num_records, locales, nationality_distribution, seed=seed, workers=workers)
+    # tolist() converts whole columns to Python values in C; zip then assembles the records
+    values = [column.tolist() for column in columns.values()]
+    return [dict(zip(columns, row)) for row in zip(*values)]
 
 sample_size = 30
 
@@ -294,6 +417,9 @@ nationality_ethnicity_mapping = {
     'TO': [('pacific_islander', 0.98), ('other', 0.02)],  # Tonga
 }
 
+ethnicity_tables = {nationality: CategoricalDistribution.from_pairs(distribution) for nationality, distribution in nationality_ethnicity_mapping.items()}
+default_ethnicity_table = CategoricalDistribution.from_pairs([('other', 1.0)])
+
 
 nationality_distribution = {
     # German nationals
@@ -322,26 +448,34 @@ nationality_distribution = {
     'NG': 0.01, # Nigeria
 }
 
+default_nationality_table = CategoricalDistribution.from_pairs(nationality_distribution.items())
 
-# Calculate the current sum of weights
-current_sum = sum(nationality_distribution.values())
 
+def write_test_data_csv(columns, path):
+    """Writes generated columns to a CSV file with a header row, in the same format as DataFrame.to_csv."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(columns)
+        writer.writerows(zip(*(column.tolist() for column in columns.values())))
 
-if current_sum < 1.0:
-    remaining_percentage = 1.0 - current_sum
-    # Distribute the remaining percentage among 'other' or adjust existing weights
-    # For this example, I'll just print a warning. In a real scenario, you'd adjust weights.
-    print(f"Warning: Nationality distribution weights sum to {current_sum}. They should sum to 1.0.")
-    print("Please adjust the weights to ensure the correct distribution.")
 
+def main():
+    """Generates the sample test data set and writes it to data/testdata.csv."""
+    # Calculate the current sum of weights
+    current_sum = sum(nationality_distribution.values())
 
-df = pd.DataFrame()
-# Generate data with the specified nationality distribution
-test_data = generate_test_data(num_records=sample_size, locales='de_DE', nationality_distribution=nationality_distribution)
-df = pd.DataFrame(test_data)
+    if current_sum < 1.0:
+        # Distribute the remaining percentage among 'other' or adjust existing weights
+        # For this example, I'll just print a warning. In a real scenario, you'd adjust weights.
+        print(f"Warning: Nationality distribution weights sum to {current_sum}. They should sum to 1.0.")
+        print("Please adjust the weights to ensure the correct distribution.")
 
-# Export the DataFrame as a CSV file
-df.to_csv('data/testdata.csv', index=False)
+    # Generate data with the specified nationality distribution
+    test_data = generate_test_columns(num_records=sample_size, locales='de_DE', nationality_distribution=nationality_distribution)
 
+    # Export the columns as a CSV file
+    write_test_data_csv(test_data, 'data/testdata.csv')
 
 
+if __name__ == "__main__":
+    main()
@@ -1,70 +1,83 @@
 # reports/report_builder.py
 
+import bisect
 import json
+import mmap
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader
+from functools import lru_cache
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, ModuleLoader, select_autoescape
+import orjson
 
 TEMPLATE_DIR = "reports/templates"
 OUTPUT_DIR = "reports/generated"
+BYTECODE_CACHE_DIR = "reports/.jinja_cache"
+COMPILED_TEMPLATES = "reports/templates_compiled.zip"
 
-def load_analysis_results(path):
-    with open(path, "r") as f:
-        return json.load(f)
 
-def build_bias_fairness_report(data, output_filename="bias_report.html"):
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+def _make_env(loader):
+    # Compiled templates are also kept on disk so new processes skip the parser
+    os.makedirs(BYTECODE_CACHE_DIR, exist_ok=True)
+    return Environment(loader=loader, auto_reload=False, cache_size=-1,
+                       autoescape=select_autoescape(["html"]),
+                       bytecode_cache=FileSystemBytecodeCache(BYTECODE_CACHE_DIR))
 
-    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
-    template = env.get_template("report_template.html")
 
-    rendered = template.render(results=data)
+def _compiled_templates_fresh():
+    """True when the precompiled archive exists and is newer than every template source"""
+    try:
+        built = os.stat(COMPILED_TEMPLATES).st_mtime
+        with os.scandir(TEMPLATE_DIR) as entries:
+            return all(entry.stat().st_mtime <= built for entry in entries)
+    except OSError:
+        return False
 
-    output_path = os.path.join(OUTPUT_DIR, output_filename)
-    with open(output_path, "w") as f:
-        f.write(rendered)
 
-    print(f"✅ Bias Report saved to {output_path}")
+# One environment per process; templates are compiled once and never re-stat'ed.
+# A fresh archive from compile_templates() is imported as-is, with no parsing at all.
+_ENV = _make_env(ModuleLoader(COMPILED_TEMPLATES) if _compiled_templates_fresh()
+                 else FileSystemLoader(TEMPLATE_DIR))
 
+@lru_cache(maxsize=None)
+def _get_template(name):
+    return _ENV.get_template(name)
 
-def build_accuracy_report(data, output_filename="accuracy_report.html"):
-    """Build accuracy analysis report"""
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+def load_analysis_results(path):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return orjson.loads(b"")  # mmap refuses empty files; raise the usual decode error
+        # Parse straight from the page cache instead of copying the file into a bytes object
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            with memoryview(m) as view:
+                try:
+                    return orjson.loads(view)
+                except orjson.JSONDecodeError:
+                    # json.dump writes NaN/Infinity, which orjson rejects
+                    return json.loads(view.tobytes())
 
-    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
-    template = env.get_template("accuracy_template.html")
+# Lower bounds of the fair/good/excellent bands for each score scale
+_SCORE_CLASSES = ("score-poor", "score-fair", "score-good", "score-excellent")
+_ROBUSTNESS_BANDS = (0.4, 0.6, 0.8)
+_CONSISTENCY_BANDS = (0.5, 0.7, 0.9)
+_TRANSPARENCY_BANDS = (70, 80, 90)  # 0-100 scale
 
-    rendered = template.render(results=data)
 
-    output_path = os.path.join(OUTPUT_DIR, output_filename)
-    with open(output_path, "w") as f:
-        f.write(rendered)
+def _score_class(score, bands):
+    """Map a score to the CSS class used for styling it"""
+    return _SCORE_CLASSES[bisect.bisect_right(bands, score)]
 
-    print(f"✅ Accuracy Report saved to {output_path}")
 
+def _prepare_results(data):
+    return {"results": data}
 
-def build_robustness_report(data, output_filename="robustness_report.html"):
-    """Build robustness analysis report"""
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
-    template = env.get_template("robustness_template.html")
-    
-    # Determine score class for styling
+def _prepare_robustness(data):
     robustness_score = data.get("robustness_score", 0)
-    if robustness_score >= 0.8:
-        score_class = "score-excellent"
-    elif robustness_score >= 0.6:
-        score_class = "score-good"
-    elif robustness_score >= 0.4:
-        score_class = "score-fair"
-    else:
-        score_class = "score-poor"
     
-    # Prepare template variables
-    template_vars = {
+    return {
         "robustness_score": robustness_score,
-        "score_class": score_class,
+        "score_class": _score_class(robustness_score, _ROBUSTNESS_BANDS),
         "total_examples": data.get("total_examples", 0),
         "decision_consistency_rate": data.get("decision_consistency", {}).get("rate", 0),
         "consistent_decisions": data.get("decision_consistency", {}).get("consistent_count", 0),
@@ -74,37 +87,13 @@ def build_robustness_report(data, output_filename="robustness_report.html"):
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
 
-    rendered = template.render(**template_vars)
-
-    output_path = os.path.join(OUTPUT_DIR, output_filename)
-    with open(output_path, "w") as f:
-        f.write(rendered)
-
-    print(f"✅ Robustness Report saved to {output_path}")
 
-
-def build_consistency_report(data, output_filename="consistency_report.html"):
-    """Build consistency analysis report"""
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
-    template = env.get_template("consistency_template.html")
-    
-    # Determine score class for styling
+def _prepare_consistency(data):
     consistency_score = data.get("overall_consistency_score", 0)
-    if consistency_score >= 0.9:
-        score_class = "score-excellent"
-    elif consistency_score >= 0.7:
-        score_class = "score-good"
-    elif consistency_score >= 0.5:
-        score_class = "score-fair"
-    else:
-        score_class = "score-poor"
     
-    # Prepare template variables
-    template_vars = {
+    return {
         "overall_consistency_score": consistency_score,
-        "score_class": score_class,
+        "score_class": _score_class(consistency_score, _CONSISTENCY_BANDS),
         "total_inputs": data.get("total_inputs", 0),
         "total_responses": data.get("total_responses", 0),
         "perfect_consistency": data.get("perfect_consistency", 0),
@@ -116,40 +105,17 @@ def build_consistency_report(data, output_filename="consistency_report.html"):
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
 
-    rendered = template.render(**template_vars)
 
-    output_path = os.path.join(OUTPUT_DIR, output_filename)
-    with open(output_path, "w") as f:
-        f.write(rendered)
-
-    print(f"✅ Consistency Report saved to {output_path}")
-
-def build_transparency_report(data, output_filename="transparency_report.html"):
-    """Build transparency analysis report"""
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
-    template = env.get_template("transparency_template.html")
-    
+def _prepare_transparency(data):
     # Extract summary data
     summary = data.get("summary", {})
     
-    # Determine score class for styling
     avg_quality_score = summary.get("average_quality_score", 0)
-    if avg_quality_score >= 90:
-        score_class = "score-excellent"
-    elif avg_quality_score >= 80:
-        score_class = "score-good"
-    elif avg_quality_score >= 70:
-        score_class = "score-fair"
-    else:
-        score_class = "score-poor"
     
-    # Prepare template variables
-    template_vars = {
+    return {
         "summary": summary,
         "average_quality_score": avg_quality_score,
-        "score_class": score_class,
+        "score_class": _score_class(avg_quality_score, _TRANSPARENCY_BANDS),
         "total_analyzed": summary.get("total_analyzed", 0),
         "compliance_rate": summary.get("compliance_rate", 0),
         "category_distribution": summary.get("category_distribution", {}),
@@ -160,35 +126,102 @@ def build_transparency_report(data, output_filename="transparency_report.html"):
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
 
-    rendered = template.render(**template_vars)
-
-    output_path = os.path.join(OUTPUT_DIR, output_filename)
-    with open(output_path, "w") as f:
-        f.write(rendered)
-
-    print(f"✅ Transparency Report saved to {output_path}")
 
-def build_comprehensive_data_quality_report(data, output_filename="comprehensive_data_quality_report.html"):
-    """Build comprehensive data quality report from analysis results"""
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    
-    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
-    template = env.get_template("comprehensive_data_quality_template.html")
-    
-    # Prepare template variables
-    template_vars = {
+def _prepare_data_quality(data):
+    return {
         "data_quality": data.get("data_quality", {}),
         "total_responses_analyzed": data.get("total_responses_analyzed", 0),
         "module_breakdown": data.get("module_breakdown", {}),
         "comprehensive_data_file": data.get("comprehensive_data_file"),
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
-    
-    rendered = template.render(**template_vars)
-    
-    output_path = os.path.join(OUTPUT_DIR, output_filename)
-    with open(output_path, "w") as f:
-        f.write(rendered)
-    
-    print(f"✅ Comprehensive Data Quality Report saved to {output_path}")
+
+
+# kind -> (template, template-variable builder, default output file, report label)
+_REPORT_SPECS = {
+    "bias_fairness": ("report_template.html", _prepare_results, "bias_report.html", "Bias Report"),
+    "accuracy": ("accuracy_template.html", _prepare_results, "accuracy_report.html", "Accuracy Report"),
+    "robustness": ("robustness_template.html", _prepare_robustness, "robustness_report.html", "Robustness Report"),
+    "consistency": ("consistency_template.html", _prepare_consistency, "consistency_report.html", "Consistency Report"),
+    "transparency": ("transparency_template.html", _prepare_transparency, "transparency_report.html", "Transparency Report"),
+    "comprehensive_data_quality": ("comprehensive_data_quality_template.html", _prepare_data_quality,
+                                   "comprehensive_data_quality_report.html", "Comprehensive Data Quality Report"),
+}
+
+
+def build_report(kind, data, output_filename=None):
+    """Render the report of the given kind and write it to OUTPUT_DIR"""
+    template_name, prepare, default_filename, label = _REPORT_SPECS[kind]
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    output_path = os.path.join(OUTPUT_DIR, output_filename or default_filename)
+    # Stream the rendered chunks to a temp file, then swap it in so viewers never see a partial report
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        stream = _get_template(template_name).stream(**prepare(data))
+        # Join small template chunks before writing instead of one write() per node
+        stream.enable_buffering(size=50)
+        stream.dump(f)
+    os.replace(tmp_path, output_path)
+
+    print(f"✅ {label} saved to {output_path}")
     return output_path
+
+
+def compile_templates(target=COMPILED_TEMPLATES):
+    """Precompile the report templates into a zip archive for ModuleLoader"""
+    names = {template_name for template_name, *_ in _REPORT_SPECS.values()}
+    _make_env(FileSystemLoader(TEMPLATE_DIR)).compile_templates(
+        target, zip="deflated", filter_func=names.__contains__, ignore_errors=False)
+
+
+def preload_templates():
+    """Compile every report template up front
+
+    Used as the report pool's worker initializer so each worker has the
+    templates compiled before its first render.
+    """
+    for template_name, *_ in _REPORT_SPECS.values():
+        _get_template(template_name)
+
+
+def build_all_reports(results_by_kind, max_workers=None):
+    """Build several reports concurrently, overlapping their file I/O
+
+    Takes a dict of kind -> analysis results and returns kind -> output path.
+    Each report writes its own file, so the builds share nothing but the
+    template cache.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or len(results_by_kind) or 1) as executor:
+        futures = {kind: executor.submit(build_report, kind, data) for kind, data in results_by_kind.items()}
+        return {kind: future.result() for kind, future in futures.items()}
+
+
+def build_bias_fairness_report(data, output_filename="bias_report.html"):
+    """Build bias and fairness analysis report"""
+    return build_report("bias_fairness", data, output_filename)
+
+
+def build_accuracy_report(data, output_filename="accuracy_report.html"):
+    """Build accuracy analysis report"""
+    return build_report("accuracy", data, output_filename)
+
+
+def build_robustness_report(data, output_filename="robustness_report.html"):
+    """Build robustness analysis report"""
+    return build_report("robustness", data, output_filename)
+
+
+def build_consistency_report(data, output_filename="consistency_report.html"):
+    """Build consistency analysis report"""
+    return build_report("consistency", data, output_filename)
+
+
+def build_transparency_report(data, output_filename="transparency_report.html"):
+    """Build transparency analysis report"""
+    return build_report("transparency", data, output_filename)
+
+
+def build_comprehensive_data_quality_report(data, output_filename="comprehensive_data_quality_report.html"):
+    """Build comprehensive data quality report from analysis results"""
+    return build_report("comprehensive_data_quality", data, output_filename)
@@ -8,6 +8,10 @@ echo "Starting Credit Scoring Validator..."
 # Create necessary directories
 mkdir -p data reports/generated reports/archive results/responses
 
+# Precompile the report templates so workers import them instead of parsing
+echo "Compiling report templates..."
+python -c "from reports.report_builder import compile_templates; compile_templates()"
+
 # Start the application with Gunicorn
 echo "Starting Gunicorn server..."
 exec gunicorn app:app --config gunicorn.conf.py
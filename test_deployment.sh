@@ -53,8 +53,9 @@ if user:
     if auth_user and auth_user.username == 'testuser':
         print('✅ Authentication system works')
         # Cleanup
-        if os.path.exists('auth/users.json'):
-            os.remove('auth/users.json')
+        for path in ('auth/users.json', 'auth/users.log'):
+            if os.path.exists(path):
+                os.remove(path)
     else:
         print('❌ Authentication failed')
         exit(1)
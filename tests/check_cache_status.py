@@ -5,10 +5,38 @@ Shows which analysis modules use cached data and how to clear them
 """
 
 import os
+import sys
 import glob
 
-def check_cached_files():
-    """Check which analysis modules use cached response files"""
+def count_lines(file_path):
+    """Count the lines of a file in 1 MiB chunks without building line objects"""
+    count = 0
+    last = b"\n"
+    with open(file_path, 'rb', buffering=0) as f:
+        for buf in iter(lambda: f.read(1 << 20), b""):
+            count += buf.count(b"\n")
+            last = buf[-1:]
+    # Match readlines(): a final line without a trailing newline still counts
+    return count + (last != b"\n")
+
+def estimate_lines(file_path, sample_size=64 * 1024):
+    """Estimate the line count from the file size and the line density of three samples"""
+    size = os.path.getsize(file_path)
+    if size <= 3 * sample_size:
+        return count_lines(file_path)
+    newlines = 0
+    with open(file_path, 'rb') as f:
+        # Start, middle and end, since analysis modules append records of different sizes
+        for offset in (0, (size - sample_size) // 2, size - sample_size):
+            f.seek(offset)
+            newlines += f.read(sample_size).count(b"\n")
+    return round(size * newlines / (3 * sample_size))
+
+def check_cached_files(exact=False):
+    """Check which analysis modules use cached response files
+
+    Record counts are estimated from each file's size unless exact is set.
+    """
     
     print("🗂️  ANALYSIS CACHE MANAGEMENT GUIDE")
     print("=" * 50)
@@ -48,36 +76,39 @@ def check_cached_files():
     if os.path.exists(response_dir):
         existing_files = [f for f in os.listdir(response_dir) if f.endswith('.jsonl')]
     
-    print("📋 CACHE STATUS:")
-    print("-" * 30)
+    # Assemble the status section and write it in one go
+    lines = ["📋 CACHE STATUS:", "-" * 30]
     
     for cache_file, info in cache_info.items():
         exists = cache_file in existing_files
         status = "✅ EXISTS" if exists else "❌ NOT FOUND"
         
-        print(f"\n🎯 {info['analysis']}")
-        print(f"   File: {cache_file}")
-        print(f"   Status: {status}")
-        print(f"   Behavior: {info['behavior']}")
-        print(f"   Sample Impact: {info['sample_size_impact']}")
+        lines += [
+            f"\n🎯 {info['analysis']}",
+            f"   File: {cache_file}",
+            f"   Status: {status}",
+            f"   Behavior: {info['behavior']}",
+            f"   Sample Impact: {info['sample_size_impact']}",
+        ]
         
         if exists:
             file_path = os.path.join(response_dir, cache_file)
             try:
-                with open(file_path, 'r') as f:
-                    lines = len(f.readlines())
-                print(f"   📊 Cached Records: {lines}")
+                if exact:
+                    lines.append(f"   📊 Cached Records: {count_lines(file_path)}")
+                else:
+                    lines.append(f"   📊 Cached Records: ~{estimate_lines(file_path)}")
             except:
-                print(f"   📊 Cached Records: Unable to count")
+                lines.append(f"   📊 Cached Records: Unable to count")
     
-    print(f"\n📁 OTHER FILES IN {response_dir}:")
-    print("-" * 30)
+    lines += [f"\n📁 OTHER FILES IN {response_dir}:", "-" * 30]
     other_files = [f for f in existing_files if f not in cache_info.keys()]
     if other_files:
-        for file in other_files:
-            print(f"   • {file}")
+        lines += [f"   • {file}" for file in other_files]
     else:
-        print("   (none)")
+        lines.append("   (none)")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
     
     print(f"\n🧹 TO CLEAR CACHE AND FORCE FRESH DATA:")
     print("=" * 45)
@@ -102,4 +133,4 @@ def check_cached_files():
 if __name__ == "__main__":
     # Set up environment
     os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    check_cached_files()
+    check_cached_files(exact="--exact" in sys.argv[1:])
@@ -0,0 +1,38 @@
+# tests/conftest.py
+
+import os
+import pytest
+
+
+# Modules that read, write or delete the shared results/ and reports/ trees; they race
+# each other under pytest-xdist, so they are marked serial and run in a separate pass
+SHARED_STATE_MODULES = {
+    "test_archiving",
+    "test_bias_data_processing",
+    "test_bias_fairness",
+    "test_cache_clearing",
+    "test_report_generator",
+}
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "integration: calls the live scoring API; runs only with RUN_INTEGRATION=1"
+    )
+    config.addinivalue_line(
+        "markers", "serial: touches shared result files; keep out of parallel (-n) runs"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Mark shared-state tests serial, and skip live-API tests unless RUN_INTEGRATION=1 is set"""
+    for item in items:
+        if item.module.__name__.rpartition(".")[2] in SHARED_STATE_MODULES:
+            item.add_marker(pytest.mark.serial)
+    
+    if os.environ.get("RUN_INTEGRATION") == "1":
+        return
+    skip_integration = pytest.mark.skip(reason="calls the live scoring API; set RUN_INTEGRATION=1 to run")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip_integration)
@@ -6,17 +6,28 @@ Debug script to test API calls and identify issues
 import sys
 import pandas as pd
 from api.client import send_request, construct_payload
-import json
+from api.async_client import send_requests
+import orjson
+
+def pretty_json(obj):
+    """Indented JSON for console output; anything orjson can't encode is stringified"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str).decode("utf-8")
+
+# The checks below look at most at the first SAMPLE_ROWS records, so only those
+# are parsed. Postal codes stay strings so leading zeros survive.
+SAMPLE_ROWS = 20
+_DF = pd.read_csv('data/testdata.csv', nrows=SAMPLE_ROWS, dtype={"postal_code": str})
 
 def test_single_record():
     """Test with a single record from the CSV"""
-    df = pd.read_csv('data/testdata.csv')
+    df = _DF
     
     print("=" * 60)
     print("TESTING FIRST RECORD FROM CSV")
     print("=" * 60)
     
-    first_row = df.iloc[0].to_dict()
+    # Build the dict straight from the column arrays rather than boxing a row Series
+    first_row = next(df.itertuples(index=False))._asdict()
     print("Raw CSV data:")
     for key, value in first_row.items():
         print(f"  {key}: {value} (type: {type(value)})")
@@ -26,14 +37,14 @@ def test_single_record():
     print("=" * 60)
     
     payload = construct_payload(first_row)
-    print(json.dumps(payload, indent=2, default=str))
+    print(pretty_json(payload))
     
     print("\n" + "=" * 60)
     print("API RESPONSE")
     print("=" * 60)
     
     response = send_request(first_row)
-    print(json.dumps(response, indent=2, default=str))
+    print(pretty_json(response))
     
     return response
 
@@ -43,16 +54,15 @@ def test_postal_code_formatting():
     print("TESTING POSTAL CODE FORMATTING")
     print("=" * 60)
     
-    df = pd.read_csv('data/testdata.csv')
+    postal = _DF['postal_code'].head(10)
+    postal_str = postal.astype(str)
+    # Test if leading zeros are preserved
+    too_short = (postal_str.str.len() < 5).tolist()
     
-    print("Postal codes in dataset:")
-    for i, row in df.head(10).iterrows():
-        postal = row['postal_code']
-        postal_str = str(postal)
-        print(f"  Row {i}: '{postal}' -> '{postal_str}' (original type: {type(postal)})")
-        
-        # Test if leading zeros are preserved
-        if len(postal_str) < 5:
+    print(f"Postal codes in dataset (column dtype: {postal.dtype}):")
+    for i, original, converted, short in zip(postal.index, postal.tolist(), postal_str.tolist(), too_short):
+        print(f"  Row {i}: '{original}' -> '{converted}' (original type: {type(original)})")
+        if short:
             print(f"    ⚠️  WARNING: Postal code too short! Should be 5 digits.")
 
 def test_working_payload():
@@ -88,11 +98,29 @@ def test_working_payload():
     
     print("Test payload:")
     payload = construct_payload(test_data)
-    print(json.dumps(payload, indent=2))
+    print(pretty_json(payload))
     
     print("\nAPI Response:")
     response = send_request(test_data)
-    print(json.dumps(response, indent=2, default=str))
+    print(pretty_json(response))
+
+def test_batch_records(num_records=SAMPLE_ROWS):
+    """Send the first records from the CSV concurrently over one shared client"""
+    print("\n" + "=" * 60)
+    print(f"TESTING FIRST {num_records} RECORDS CONCURRENTLY")
+    print("=" * 60)
+    
+    rows = _DF.head(num_records).to_dict("records")
+    
+    responses = send_requests(rows)
+    for row, response in zip(rows, responses):
+        if response.get("status") == "success":
+            parsed = response["parsed"]
+            print(f"  ✅ {row['name']}: {parsed.get('credit_score')} ({parsed.get('classification')})")
+        else:
+            print(f"  ❌ {row['name']}: {response.get('error_type')} - {response.get('error')}")
+    
+    return responses
 
 if __name__ == "__main__":
     print("🔍 API DEBUG SCRIPT")
@@ -106,3 +134,6 @@ if __name__ == "__main__":
     
     # Test with actual CSV data
     test_single_record()
+    
+    # Test several CSV records in flight at once
+    test_batch_records()
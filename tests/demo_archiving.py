@@ -9,6 +9,32 @@ import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app import clear_analysis_cache
+from jinja2 import Template
+
+# Compiled once; each sample report is a render of this template. Jinja strips the
+# final newline by default, so it is kept to end each report with "</html>\n"
+_REPORT_TEMPLATE = Template("""
+<!DOCTYPE html>
+<html>
+<head>
+    <title>{{ title }}</title>
+    <style>
+        body { font-family: Arial, sans-serif; padding: 20px; }
+        .header { background: #f0f0f0; padding: 10px; border-radius: 5px; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>{{ title }}</h1>
+        <p>Generated: {{ timestamp }}</p>
+    </div>
+    <div class="content">
+        <p>This is a sample report for demonstration purposes.</p>
+        <p>Report type: {{ filename }}</p>
+    </div>
+</body>
+</html>
+""", keep_trailing_newline=True)
 
 def demo_archiving():
     """Demonstrate the archiving feature"""
@@ -31,35 +57,21 @@ def demo_archiving():
     print("📝 Creating sample reports...")
     for filename, title in sample_reports:
         report_path = os.path.join(reports_dir, filename)
-        with open(report_path, "w") as f:
-            f.write(f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>{title}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; padding: 20px; }}
-        .header {{ background: #f0f0f0; padding: 10px; border-radius: 5px; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>{title}</h1>
-        <p>Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}</p>
-    </div>
-    <div class="content">
-        <p>This is a sample report for demonstration purposes.</p>
-        <p>Report type: {filename}</p>
-    </div>
-</body>
-</html>
-            """)
+        html_bytes = _REPORT_TEMPLATE.render(
+            title=title,
+            filename=filename,
+            timestamp=time.strftime('%Y-%m-%d %H:%M:%S')
+        ).encode("utf-8")
+        # Encoded once, written in a single call through the binary layer
+        with open(report_path, "wb") as f:
+            f.write(html_bytes)
         print(f"   ✅ {filename}")
     
     print(f"\n📂 Current reports in {reports_dir}:")
-    for file in os.listdir(reports_dir):
-        if file.endswith('.html'):
-            print(f"   📄 {file}")
+    with os.scandir(reports_dir) as it:
+        for entry in it:
+            if entry.name.endswith('.html'):
+                print(f"   📄 {entry.name}")
     
     print("\n🧹 Simulating cache clearing (which triggers archiving)...")
     print("   This happens automatically when you clear cache in the web interface")
@@ -86,20 +98,21 @@ def demo_archiving():
     archive_dir = "reports/archive"
     print(f"\n📁 Archive directory structure:")
     if os.path.exists(archive_dir):
-        for folder in sorted(os.listdir(archive_dir)):
-            folder_path = os.path.join(archive_dir, folder)
-            if os.path.isdir(folder_path):
-                print(f"   📁 {folder}/")
-                for file in sorted(os.listdir(folder_path)):
-                    print(f"      📄 {file}")
+        with os.scandir(archive_dir) as it:
+            folders = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+        for folder in folders:
+            print(f"   📁 {folder.name}/")
+            for file in sorted(os.listdir(folder.path)):
+                print(f"      📄 {file}")
     
     print(f"\n📂 Reports remaining in {reports_dir}:")
     remaining = []
     if os.path.exists(reports_dir):
-        for file in os.listdir(reports_dir):
-            if file.endswith('.html'):
-                remaining.append(file)
-                print(f"   📄 {file}")
+        with os.scandir(reports_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.html'):
+                    remaining.append(entry.name)
+                    print(f"   📄 {entry.name}")
     
     if not remaining:
         print("   (none - all reports were archived)")
@@ -7,13 +7,64 @@ Shows the full workflow from report creation to archiving
 import sys
 import os
 import time
-import shutil
 from datetime import datetime
 
 # Add the parent directory to sys.path to import app modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app import clear_analysis_cache, archive_existing_reports
+from jinja2 import Template
+
+# Compiled once; each sample report is a render of this template
+_REPORT_TEMPLATE = Template("""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{{ title }}</title>
+    <style>
+        body { 
+            font-family: Arial, sans-serif; 
+            margin: 0; 
+            padding: 20px; 
+            background: #f5f5f5;
+        }
+        .container {
+            max-width: 800px;
+            margin: 0 auto;
+            background: white;
+            padding: 30px;
+            border-radius: 10px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        }
+        .header {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 20px;
+            border-radius: 8px;
+            margin-bottom: 20px;
+        }
+        h1 { margin: 0; }
+        .timestamp { opacity: 0.8; margin-top: 10px; font-size: 0.9em; }
+        .content { line-height: 1.6; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>{{ title }}</h1>
+            <div class="timestamp">Generated: {{ timestamp }}</div>
+        </div>
+        <div class="content">
+            {{ content }}
+            <p><strong>Report Status:</strong> Ready for archiving test</p>
+            <p><strong>File:</strong> {{ filename }}</p>
+        </div>
+    </div>
+</body>
+</html>
+""")
 
 def reset_test_environment():
     """Clean up test environment"""
@@ -22,16 +73,29 @@ def reset_test_environment():
     # Clean generated reports
     reports_dir = "reports/generated"
     if os.path.exists(reports_dir):
-        for file in os.listdir(reports_dir):
-            if file.endswith('.html'):
-                os.remove(os.path.join(reports_dir, file))
+        with os.scandir(reports_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.html'):
+                    os.remove(entry.path)
     
     # Clean test archives (keep real archives)
     archive_dir = "reports/archive" 
     if os.path.exists(archive_dir):
-        for folder in os.listdir(archive_dir):
-            if folder.startswith('test_archive_'):
-                shutil.rmtree(os.path.join(archive_dir, folder))
+        with os.scandir(archive_dir) as it:
+            targets = [e.path for e in it if e.name.startswith('test_archive_') and e.is_dir(follow_symlinks=False)]
+        # Bottom-up walk: unlink the files, then remove the emptied directories
+        for target in targets:
+            for root, dirs, files in os.walk(target, topdown=False):
+                for name in files:
+                    os.unlink(os.path.join(root, name))
+                for name in dirs:
+                    path = os.path.join(root, name)
+                    # os.walk lists symlinks to directories in dirs; they are unlinked, not removed
+                    if os.path.islink(path):
+                        os.unlink(path)
+                    else:
+                        os.rmdir(path)
+            os.rmdir(target)
     
     print("   ✅ Environment reset complete")
 
@@ -77,58 +141,15 @@ def create_sample_reports():
     
     for report in sample_reports:
         report_path = os.path.join(reports_dir, report["filename"])
-        html_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{report["title"]}</title>
-    <style>
-        body {{ 
-            font-family: Arial, sans-serif; 
-            margin: 0; 
-            padding: 20px; 
-            background: #f5f5f5;
-        }}
-        .container {{
-            max-width: 800px;
-            margin: 0 auto;
-            background: white;
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 8px;
-            margin-bottom: 20px;
-        }}
-        h1 {{ margin: 0; }}
-        .timestamp {{ opacity: 0.8; margin-top: 10px; font-size: 0.9em; }}
-        .content {{ line-height: 1.6; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>{report["title"]}</h1>
-            <div class="timestamp">Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</div>
-        </div>
-        <div class="content">
-            {report["content"]}
-            <p><strong>Report Status:</strong> Ready for archiving test</p>
-            <p><strong>File:</strong> {report["filename"]}</p>
-        </div>
-    </div>
-</body>
-</html>
-        """
+        html_content = _REPORT_TEMPLATE.render(
+            title=report["title"],
+            content=report["content"],
+            filename=report["filename"],
+            timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
         
-        with open(report_path, 'w') as f:
-            f.write(html_content.strip())
+        with open(report_path, 'wb') as f:
+            f.write(html_content.strip().encode("utf-8"))
         
         print(f"   ✅ {report['filename']}")
     
@@ -150,11 +171,11 @@ def demonstrate_archiving():
     print(f"\n📂 Current reports in reports/generated/:")
     reports_dir = "reports/generated"
     current_reports = []
-    for file in os.listdir(reports_dir):
-        if file.endswith('.html'):
-            current_reports.append(file)
-            file_size = os.path.getsize(os.path.join(reports_dir, file))
-            print(f"   📄 {file} ({file_size:,} bytes)")
+    with os.scandir(reports_dir) as it:
+        for entry in it:
+            if entry.name.endswith('.html') and entry.is_file(follow_symlinks=False):
+                current_reports.append(entry.name)
+                print(f"   📄 {entry.name} ({entry.stat().st_size:,} bytes)")
     
     print(f"\n📊 Status: {len(current_reports)} reports ready for archiving")
     
@@ -193,23 +214,24 @@ def demonstrate_archiving():
     print(f"\n📁 Archive Directory Structure:")
     archive_base = "reports/archive"
     if os.path.exists(archive_base):
-        archives = sorted([d for d in os.listdir(archive_base) if os.path.isdir(os.path.join(archive_base, d))])
+        with os.scandir(archive_base) as it:
+            archives = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
         for archive_folder in archives:
-            archive_path = os.path.join(archive_base, archive_folder)
-            files = [f for f in os.listdir(archive_path) if f.endswith('.html')]
-            print(f"   📁 {archive_folder}/ ({len(files)} files)")
-            for file in sorted(files):
-                file_size = os.path.getsize(os.path.join(archive_path, file))
-                print(f"      📄 {file} ({file_size:,} bytes)")
+            with os.scandir(archive_folder.path) as it:
+                files = sorted((e for e in it if e.name.endswith('.html')), key=lambda e: e.name)
+            print(f"   📁 {archive_folder.name}/ ({len(files)} files)")
+            for entry in files:
+                print(f"      📄 {entry.name} ({entry.stat().st_size:,} bytes)")
     
     # Step 7: Show current state after archiving
     print(f"\n📂 reports/generated/ after archiving:")
     remaining_files = []
     if os.path.exists(reports_dir):
-        for file in os.listdir(reports_dir):
-            if file.endswith('.html'):
-                remaining_files.append(file)
-                print(f"   📄 {file}")
+        with os.scandir(reports_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.html'):
+                    remaining_files.append(entry.name)
+                    print(f"   📄 {entry.name}")
     
     if not remaining_files:
         print("   (empty - all reports were archived)")
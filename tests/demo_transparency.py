@@ -9,9 +9,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from analysis.transparency import run_transparency_analysis
 from reports.report_builder import build_transparency_report
+import argparse
 import json
 
-def main():
+def main(skip_report=False):
     """Run transparency analysis and display results"""
     print("🔍 Credit Scoring Transparency Analysis")
     print("=" * 50)
@@ -89,13 +90,16 @@ def main():
                     print(f"     Top LIME Features: {', '.join([f'{name} (+{imp:.3f})' for name, imp in top_features])}")
     
     # Build report
-    print(f"\n📄 Building HTML report...")
-    try:
-        build_transparency_report(results)
-        print(f"✅ Transparency analysis complete!")
-        print(f"📁 Report saved to: reports/generated/transparency_report.html")
-    except Exception as e:
-        print(f"❌ Error building report: {str(e)}")
+    if skip_report:
+        print(f"\n✅ Transparency analysis complete! (report skipped)")
+    else:
+        print(f"\n📄 Building HTML report...")
+        try:
+            build_transparency_report(results)
+            print(f"✅ Transparency analysis complete!")
+            print(f"📁 Report saved to: reports/generated/transparency_report.html")
+        except Exception as e:
+            print(f"❌ Error building report: {str(e)}")
     
     print(f"\n🎯 Analysis Details:")
     print(f"   Total responses processed: {results.get('total_responses', 0)}")
@@ -107,4 +111,7 @@ def main():
         print(f"   🔴 Overall quality is POOR - significant improvements needed")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Transparency analysis demo")
+    parser.add_argument("--skip-report", "--fast", dest="skip_report", action="store_true",
+                        help="skip building the HTML report")
+    main(skip_report=parser.parse_args().skip_report)
@@ -3,21 +3,94 @@
 Test API endpoints to find the correct one
 """
 
-import requests
-from requests.auth import HTTPBasicAuth
+import asyncio
+import httpx
+import importlib.util
 import json
+import pytest
 
 # API configuration
 API_URL = "https://verbose-space-journey-7x4gr9xx4xwfw4r7-8000.app.github.dev"
 USERNAME = "FS_Group4"
 PASSWORD = "ExpLearn123"
 
+# Every probe here talks to the live API
+pytestmark = pytest.mark.integration
+
+TEST_PAYLOAD = {
+    "name": "Test User",
+    "income": 50000,
+    "employment_status": "employed",
+    "employment_duration_years": 5,
+    "existing_loans": 1,
+    "loan_amount": 10000,
+    "credit_limit": 20000,
+    "used_credit": 5000,
+    "payment_defaults": 0,
+    "credit_inquiries_last_6_months": 1,
+    "housing_status": "owner",
+    "address_stability_years": 3,
+    "household_size": 2,
+    "protected_attributes": {
+        "age": 30,
+        "gender": "male",
+        "nationality": "DE",
+        "ethnicity": "white",
+        "disability_status": "none",
+        "education_level": "bachelor_degree",
+        "marital_status": "single",
+        "postal_code": "12345",
+        "language_preference": "de"
+    },
+    "scoring_parameters": {
+        "model": "gpt-4.1-mini-2025-04-14",
+        "temperature": 1,
+        "top_p": 1,
+        "max_tokens": 512,
+        "presence_penalty": 0,
+        "frequency_penalty": 0,
+        "seed": 0
+    }
+}
+
+# HTTP/2 lets all probes share one multiplexed connection; it needs the optional
+# h2 package (pip install "httpx[http2]"), otherwise the pool falls back to HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+def make_client():
+    """One pooled client per probe run; the probes share its keep-alive connections"""
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        auth=(USERNAME, PASSWORD),
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+        timeout=30.0
+    )
+
+async def _request(client, method, url, **kwargs):
+    """Send one request; transport errors are returned instead of raised"""
+    try:
+        return await client.request(method, url, **kwargs)
+    except httpx.HTTPError as e:
+        return e
+
+async def _probe_endpoint(client, endpoint):
+    """GET the endpoint, and also POST the test payload to scoring-like endpoints"""
+    url = f"{API_URL}{endpoint}"
+    get_result = _request(client, "GET", url, timeout=10)
+    if "score" in endpoint or endpoint in ["/predict", "/"]:
+        return await asyncio.gather(get_result, _request(client, "POST", url, json=TEST_PAYLOAD))
+    return await get_result, None
+
+async def _probe_endpoints(endpoints):
+    async with make_client() as client:
+        return await asyncio.gather(*(_probe_endpoint(client, endpoint) for endpoint in endpoints))
+
 def test_endpoints():
     """Test various possible API endpoints"""
-    
+
     endpoints_to_test = [
         "/score",
-        "/predict/score", 
+        "/predict/score",
         "/api/score",
         "/v1/score",
         "/scoring",
@@ -26,102 +99,67 @@ def test_endpoints():
         "/health",
         "/docs"
     ]
-    
+
     print("🔍 Testing API endpoints...")
     print(f"Base URL: {API_URL}")
     print(f"Auth: {USERNAME} / {PASSWORD}")
+    print(f"HTTP/2: {'enabled' if HTTP2_AVAILABLE else 'unavailable (install httpx[http2])'}")
     print("=" * 60)
-    
-    for endpoint in endpoints_to_test:
+
+    # All probes run concurrently; results are reported in the order above
+    results = asyncio.run(_probe_endpoints(endpoints_to_test))
+
+    for endpoint, (response, post_response) in zip(endpoints_to_test, results):
         url = f"{API_URL}{endpoint}"
         print(f"\n🔗 Testing: {endpoint}")
-        
-        try:
-            # Try GET first
-            response = requests.get(url, auth=HTTPBasicAuth(USERNAME, PASSWORD), timeout=10)
-            print(f"  GET {response.status_code}: {response.reason}")
+
+        if isinstance(response, Exception):
+            print(f"  GET ERROR: {response}")
+        else:
+            print(f"  GET {response.status_code}: {response.reason_phrase}")
             if response.status_code == 200:
                 try:
                     content = response.text[:200] + "..." if len(response.text) > 200 else response.text
                     print(f"  Content: {content}")
                 except:
-                    print(f"  Content length: {len(response.text)} bytes")
-            
-        except requests.RequestException as e:
-            print(f"  GET ERROR: {e}")
-        
-        # Try POST for scoring endpoints
-        if "score" in endpoint or endpoint in ["/predict", "/"]:
+                    print(f"  Content length: {len(response.content)} bytes")
+
+        # POST result for scoring endpoints
+        if post_response is None:
+            continue
+        if isinstance(post_response, Exception):
+            print(f"  POST ERROR: {post_response}")
+            continue
+
+        response = post_response
+        print(f"  POST {response.status_code}: {response.reason_phrase}")
+
+        if response.status_code == 200:
             try:
-                test_payload = {
-                    "name": "Test User",
-                    "income": 50000,
-                    "employment_status": "employed",
-                    "employment_duration_years": 5,
-                    "existing_loans": 1,
-                    "loan_amount": 10000,
-                    "credit_limit": 20000,
-                    "used_credit": 5000,
-                    "payment_defaults": 0,
-                    "credit_inquiries_last_6_months": 1,
-                    "housing_status": "owner",
-                    "address_stability_years": 3,
-                    "household_size": 2,
-                    "protected_attributes": {
-                        "age": 30,
-                        "gender": "male",
-                        "nationality": "DE",
-                        "ethnicity": "white",
-                        "disability_status": "none",
-                        "education_level": "bachelor_degree",
-                        "marital_status": "single",
-                        "postal_code": "12345",
-                        "language_preference": "de"
-                    },
-                    "scoring_parameters": {
-                        "model": "gpt-4.1-mini-2025-04-14",
-                        "temperature": 1,
-                        "top_p": 1,
-                        "max_tokens": 512,
-                        "presence_penalty": 0,
-                        "frequency_penalty": 0,
-                        "seed": 0
-                    }
-                }
-                
-                response = requests.post(
-                    url, 
-                    json=test_payload,
-                    auth=HTTPBasicAuth(USERNAME, PASSWORD), 
-                    timeout=30
-                )
-                print(f"  POST {response.status_code}: {response.reason}")
-                
-                if response.status_code == 200:
-                    try:
-                        result = response.json()
-                        print(f"  ✅ SUCCESS! Response: {json.dumps(result, indent=2)[:300]}...")
-                        return url  # Return successful endpoint
-                    except:
-                        print(f"  Response not JSON: {response.text[:200]}...")
-                elif response.status_code == 422:
-                    print(f"  ⚠️  Validation error: {response.text[:200]}...")
-                else:
-                    print(f"  Response: {response.text[:200]}...")
-                    
-            except requests.RequestException as e:
-                print(f"  POST ERROR: {e}")
-    
+                result = response.json()
+                print(f"  ✅ SUCCESS! Response: {json.dumps(result, indent=2)[:300]}...")
+                return url  # Return successful endpoint
+            except:
+                print(f"  Response not JSON: {response.text[:200]}...")
+        elif response.status_code == 422:
+            print(f"  ⚠️  Validation error: {response.text[:200]}...")
+        else:
+            print(f"  Response: {response.text[:200]}...")
+
     return None
 
+async def _post_payloads(url, payloads):
+    async with make_client() as client:
+        return await asyncio.gather(*(_request(client, "POST", url, json=payload) for payload in payloads))
+
 def test_minimal_payload():
     """Test with a minimal payload to see what's required"""
     print("\n" + "=" * 60)
     print("🧪 Testing minimal payloads")
     print("=" * 60)
-    
+
     base_url = f"{API_URL}/score"  # Try the most likely endpoint
-    
+
     minimal_payloads = [
         # Very minimal
         {
@@ -130,7 +168,7 @@ def test_minimal_payload():
         },
         # Basic financial data
         {
-            "name": "Test User", 
+            "name": "Test User",
             "income": 50000,
             "employment_status": "employed",
             "age": 30
@@ -147,30 +185,25 @@ def test_minimal_payload():
             }
         }
     ]
-    
-    for i, payload in enumerate(minimal_payloads):
+
+    responses = asyncio.run(_post_payloads(base_url, minimal_payloads))
+
+    for i, (payload, response) in enumerate(zip(minimal_payloads, responses)):
         print(f"\n📋 Testing payload {i+1}:")
         print(json.dumps(payload, indent=2))
-        
-        try:
-            response = requests.post(
-                base_url,
-                json=payload,
-                auth=HTTPBasicAuth(USERNAME, PASSWORD),
-                timeout=30
-            )
-            print(f"Response: {response.status_code} - {response.reason}")
+
+        if isinstance(response, Exception):
+            print(f"Error: {response}")
+        else:
+            print(f"Response: {response.status_code} - {response.reason_phrase}")
             print(f"Content: {response.text[:300]}...")
-            
-        except requests.RequestException as e:
-            print(f"Error: {e}")
 
 if __name__ == "__main__":
     print("🚀 API ENDPOINT DISCOVERY")
     print("=" * 60)
-    
+
     successful_endpoint = test_endpoints()
-    
+
     if not successful_endpoint:
         print("\n❌ No working endpoints found. Trying minimal payloads...")
         test_minimal_payload()
@@ -62,12 +62,12 @@ def test_archiving():
     archive_dir = "reports/archive"
     print(f"\n📁 Archive directory contents:")
     if os.path.exists(archive_dir):
-        for folder in os.listdir(archive_dir):
-            folder_path = os.path.join(archive_dir, folder)
-            if os.path.isdir(folder_path):
-                print(f"   📁 {folder}/")
-                for file in os.listdir(folder_path):
-                    print(f"      📄 {file}")
+        with os.scandir(archive_dir) as folders:
+            for folder in folders:
+                if folder.is_dir():
+                    print(f"   📁 {folder.name}/")
+                    for file in os.listdir(folder.path):
+                        print(f"      📄 {file}")
     else:
         print("   (archive directory not found)")
     
@@ -4,6 +4,11 @@
 Progress tracking utilities for analysis modules
 """
 
+import orjson
+import threading
+from dataclasses import dataclass, field, fields
+from typing import Optional
+
 class ProgressTracker:
     """Tracks progress within an allocated range"""
     
@@ -16,9 +21,10 @@ class ProgressTracker:
         """Update progress with a value between 0.0 and 1.0 relative to allocated range"""
         if self.analysis_status:
             absolute_progress = self.start_progress + int(relative_progress * self.progress_span)
-            self.analysis_status["progress"] = absolute_progress
             if message:
-                self.analysis_status["message"] = message
+                self.analysis_status.update(progress=absolute_progress, message=message)
+            else:
+                self.analysis_status["progress"] = absolute_progress
     
     def set_status_reference(self, status_ref, start_progress=0, progress_span=100):
         """Set reference to global analysis status and progress range"""
@@ -31,3 +37,50 @@ bias_progress = ProgressTracker()
 robustness_progress = ProgressTracker()
 consistency_progress = ProgressTracker()
 accuracy_progress = ProgressTracker()
+
+
+@dataclass
+class AnalysisStatus:
+    """Lock-guarded status of the background analysis run
+    
+    Supports dict-style item access and dict-style update() so analysis
+    modules can write status fields through their status reference.
+    The JSON served to pollers is cached until a field actually changes.
+    """
+    running: bool = False
+    completed: bool = False
+    error: Optional[str] = None
+    progress: int = 0
+    message: str = "Ready to start analysis"
+    cache_message: Optional[str] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    _json: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    
+    def update(self, **changes):
+        """Apply several field changes atomically"""
+        with self._lock:
+            for name, value in changes.items():
+                if getattr(self, name) != value:
+                    setattr(self, name, value)
+                    self._json = None
+    
+    def _public_fields(self):
+        return {f.name: getattr(self, f.name) for f in fields(self) if not f.name.startswith("_")}
+    
+    def snapshot(self):
+        """Return a consistent copy of the public fields"""
+        with self._lock:
+            return self._public_fields()
+    
+    def to_json(self):
+        """Return the serialized status, re-encoding only after a change"""
+        with self._lock:
+            if self._json is None:
+                self._json = orjson.dumps(self._public_fields())
+            return self._json
+    
+    def __getitem__(self, name):
+        return getattr(self, name)
+    
+    def __setitem__(self, name, value):
+        self.update(**{name: value})
@@ -2,7 +2,7 @@
 
 import json
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 from utils.logger import setup_logger
 
 logger = setup_logger("response_collector", "results/logs/response_collector.log")
@@ -27,15 +27,36 @@ class ResponseCollector:
         self.all_responses.append(response_record)
         logger.debug(f"Added response from {module_name} (total: {len(self.all_responses)})")
     
+    def add_responses_bulk(self, module_name: str, records: List[Tuple[Dict, Dict]]):
+        """Add many (input, output) response pairs from one module in a single extend"""
+        # A list (unlike a generator) has a known length, so extend grows the store once
+        self.all_responses.extend([
+            {
+                "module": module_name,
+                "input": input_data,
+                "output": output_data,
+                "metadata": {},
+                "timestamp": None
+            }
+            for input_data, output_data in records
+        ])
+        logger.debug(f"Added {len(records)} responses from {module_name} (total: {len(self.all_responses)})")
+    
     def add_responses_batch(self, module_name: str, responses: List[Dict]):
         """Add a batch of responses from a module"""
-        for response in responses:
-            # Handle different response formats
-            if "input" in response and "output" in response:
-                self.add_response(module_name, response["input"], response["output"], response.get("metadata", {}))
-            else:
-                # For legacy format, treat the whole response as output
-                self.add_response(module_name, {}, response, {})
+        self.all_responses.extend([
+            {
+                "module": module_name,
+                "input": response["input"],
+                "output": response["output"],
+                "metadata": response.get("metadata") or {},
+                "timestamp": None
+            }
+            if "input" in response and "output" in response
+            # For legacy format, treat the whole response as output
+            else {"module": module_name, "input": {}, "output": response, "metadata": {}, "timestamp": None}
+            for response in responses
+        ])
         
         logger.info(f"Added {len(responses)} responses from {module_name}")
     